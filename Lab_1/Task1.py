@@ -1,24 +1,139 @@
+import os
+import sys
+from functools import lru_cache
+
+ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+CHUNK_SIZE = 1 << 20  # bytes read per iteration in the streaming file mode
+
 def charToIndex(c):
     return ord(c) - ord('A')
 
 def indexToChar(i):
     return chr(i + ord('A'))
 
+def buildShiftTables():
+    """
+    Precompute the translation tables for all 26 shifts, once for str and once for bytes.
+    Lowercase letters are shifted inside the lowercase alphabet, everything else is left as is.
+    """
+    strTables = []
+    byteTables = []
+    for key in range(26):
+        shifted = ''.join(indexToChar((charToIndex(c) + key) % 26) for c in ALPHABET)
+        source = ALPHABET + ALPHABET.lower()
+        target = shifted + shifted.lower()
+        strTables.append(str.maketrans(source, target))
+        byteTables.append(bytes.maketrans(source.encode('ascii'), target.encode('ascii')))
+    return strTables, byteTables
+
+STR_TABLES, BYTE_TABLES = buildShiftTables()
+
 def encrypt(text, key):
-    encryptedText = ""
-    for c in text:
-        indexC = charToIndex(c)
-        newIndex = (indexC + key) % 26
-        encryptedText += indexToChar(newIndex)
-    return encryptedText
+    return text.translate(STR_TABLES[key % 26])
 
 def decrypt(text, key):
-    decryptedText = ""
-    for c in text:
-        indexC = charToIndex(c)
-        newIndex = (indexC - key) % 26
-        decryptedText += indexToChar(newIndex)
-    return decryptedText
+    return text.translate(STR_TABLES[-key % 26])
+
+def encryptBytes(data, key):
+    """Fast path for bytes/bytearray input, no str decoding involved."""
+    return data.translate(BYTE_TABLES[key % 26])
+
+def decryptBytes(data, key):
+    return data.translate(BYTE_TABLES[-key % 26])
+
+def transformFile(inputPath, outputPath, key, chunkSize=CHUNK_SIZE):
+    """
+    Apply the shift `key` to a file of any size, reading it in fixed-size chunks.
+    The letters are one byte each, so chunk boundaries never split a character.
+    Returns the number of bytes processed.
+    """
+    table = BYTE_TABLES[key % 26]
+    processed = 0
+    with open(inputPath, 'rb') as src, open(outputPath, 'wb') as dst:
+        while True:
+            chunk = src.read(chunkSize)
+            if not chunk:
+                break
+            dst.write(chunk.translate(table))
+            processed += len(chunk)
+    return processed
+
+def encryptFile(inputPath, outputPath, key, chunkSize=CHUNK_SIZE):
+    return transformFile(inputPath, outputPath, key, chunkSize)
+
+def decryptFile(inputPath, outputPath, key, chunkSize=CHUNK_SIZE):
+    return transformFile(inputPath, outputPath, -key, chunkSize)
+
+@lru_cache(maxsize=None)
+def englishFrequencies():
+    """
+    Load the English letter frequencies from Lab_2/utils.py as a probability vector indexed A..Z.
+    It goes through the repository's load_lab_module, so it does not clash with other labs' `utils`
+    and shares the copy already loaded by cli.py or the benchmarks.
+    """
+    rootDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if rootDir not in sys.path:
+        sys.path.append(rootDir)
+    from labs import load_lab_module
+    frequency = load_lab_module('Lab_2', 'utils.py').english_language_letters_frequency
+    import numpy as np
+    probabilities = np.array([frequency[c] for c in ALPHABET], dtype=np.float64)
+    return probabilities / probabilities.sum()
+
+# numpy is only needed for cracking, so it is imported inside these functions: encrypting and
+# decrypting (also from the command line) start without paying its import time
+
+@lru_cache(maxsize=None)
+def shiftIndex():
+    """shiftIndex()[k, j] is the ciphertext letter that decodes to letter j under key k."""
+    import numpy as np
+    return (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+def letterCounts(messages):
+    """Count A-Z (case-insensitive) for every message with a single bincount, shape (len(messages), 26)."""
+    import numpy as np
+    encoded = [m.upper().encode('ascii', 'ignore') for m in messages]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+    isLetter = (data >= ord('A')) & (data <= ord('Z'))
+    flat = owner[isLetter] * 26 + (data[isLetter] - ord('A'))
+    return np.bincount(flat, minlength=len(encoded) * 26).reshape(len(encoded), 26)
+
+def chiSquared(counts):
+    """
+    Chi-squared statistic of every message decoded under all 26 keys, shape (len(counts), 26).
+    Decoding under a key only permutes the letter counts, so all keys are scored from one gather.
+    """
+    import numpy as np
+    expected = counts.sum(axis=1)[:, None, None] * englishFrequencies()[None, None, :]
+    observed = counts[:, shiftIndex()]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi = ((observed - expected) ** 2 / expected).sum(axis=2)
+    return np.nan_to_num(chi, nan=0.0)
+
+def crack(text):
+    """Return all 26 keys as (key, chi-squared) pairs, most likely key first."""
+    import numpy as np
+    scores = chiSquared(letterCounts([text]))[0]
+    return [(int(key), float(scores[key])) for key in np.argsort(scores, kind='stable')]
+
+def crackBatch(messages, batchSize=10000):
+    """
+    Crack many messages at once. Returns (keys, scores): `keys[m]` holds the 26 keys of message m
+    ranked by chi-squared and `scores[m]` the matching statistics.
+    Messages are processed in batches to bound the (batch, 26, 26) intermediate array.
+    """
+    import numpy as np
+    messages = list(messages)
+    keys = np.empty((len(messages), 26), dtype=np.int64)
+    scores = np.empty((len(messages), 26), dtype=np.float64)
+    for start in range(0, len(messages), batchSize):
+        chi = chiSquared(letterCounts(messages[start:start + batchSize]))
+        order = np.argsort(chi, axis=1, kind='stable')
+        keys[start:start + len(chi)] = order
+        scores[start:start + len(chi)] = np.take_along_axis(chi, order, axis=1)
+    return keys, scores
 
 def checkKey(key):
     if key < 0 or key > 25:
@@ -35,7 +150,7 @@ def removeSpaces(text):
 def mainTask1():
     print("Caesar algorithm for the English alphabet")
     while(True):
-        print("Possible operations: \n1. Encrypt text \n2. Decrypt text")
+        print("Possible operations: \n1. Encrypt text \n2. Decrypt text \n3. Encrypt file \n4. Decrypt file \n5. Crack text")
         operation = input("Enter operation: ")
         if(operation == "1"):
             text = input("Enter text to encrypt: ").upper()
@@ -60,6 +175,21 @@ def mainTask1():
                 continue
             if checkKey(key) and checkText(text):
                 print("Decrypted text: ", decrypt(text, key))
+        elif(operation == "3" or operation == "4"):
+            inputPath = input("Enter input file path: ")
+            outputPath = input("Enter output file path: ")
+            key = int(input("Enter key: "))
+            if(not checkKey(key)):
+                continue
+            if(operation == "3"):
+                processed = encryptFile(inputPath, outputPath, key)
+            else:
+                processed = decryptFile(inputPath, outputPath, key)
+            print("Processed bytes: ", processed)
+        elif(operation == "5"):
+            text = removeSpaces(input("Enter text to crack: ").upper())
+            for key, score in crack(text)[:3]:
+                print("Key:", key, "chi-squared:", round(score, 2), "->", decrypt(text, key))
 
 
 if __name__ == "__main__":
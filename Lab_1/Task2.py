@@ -1,3 +1,7 @@
+from functools import lru_cache
+
+CIPHER_CACHE_SIZE = 128  # compiled ciphers kept alive, one per (k1, k2) pair
+
 def removeSpaces(text):
     return ''.join(text.split())
 
@@ -16,33 +20,49 @@ def create_permuted_alphabet(keyword):
     permuted_alphabet = keyword + ''.join([ch for ch in alphabet if ch not in keyword])
     return permuted_alphabet
 
+class KeywordCaesarCipher:
+    """
+    Keyword-permuted Caesar cipher compiled for a fixed (k1, k2) pair.
+    The forward and inverse translation tables are built once, so each message costs
+    a single `str.translate` pass. Spaces are dropped by the same tables.
+    """
+
+    def __init__(self, k1, k2):
+        alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+        permuted_alphabet = create_permuted_alphabet(k2.upper())
+        shifted = ''.join(permuted_alphabet[(charToIndex(c) + k1) % 26] for c in alphabet)
+        self.k1 = k1
+        self.k2 = k2.upper()
+        self.encrypt_table = str.maketrans(alphabet, shifted, ' ')
+        self.decrypt_table = str.maketrans(shifted, alphabet, ' ')
+
+    def encrypt(self, text):
+        return text.upper().translate(self.encrypt_table)
+
+    def decrypt(self, text):
+        return text.upper().translate(self.decrypt_table)
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def _compiled_cipher(k1, k2):
+    return KeywordCaesarCipher(k1, k2)
+
+def get_cipher(k1, k2):
+    """Return the compiled cipher for (k1, k2), reusing it from a bounded LRU cache."""
+    return _compiled_cipher(k1 % 26, k2.upper())
+
 def encrypt(text, k1, k2):
-    encryptedText = ""
-    text = text.upper().replace(' ', '')  # Convert to upper case and remove spaces
-    permuted_alphabet = create_permuted_alphabet(k2.upper())  # Generate permuted alphabet
-
-    for c in text:
-        if c in permuted_alphabet:
-            indexC = charToIndex(c)
-            newIndex = (indexC + k1) % 26
-            encryptedText += permuted_alphabet[newIndex]
-        else:
-            encryptedText += c  # If character is not in the alphabet, just append it as is
-    return encryptedText
+    return get_cipher(k1, k2).encrypt(text)
 
 def decrypt(text, k1, k2):
-    decryptedText = ""
-    text = text.upper().replace(' ', '')  # Convert to upper case and remove spaces
-    permuted_alphabet = create_permuted_alphabet(k2.upper())  # Generate permuted alphabet
-
-    for c in text:
-        if c in permuted_alphabet:
-            indexC = permuted_alphabet.index(c)
-            newIndex = (indexC - k1) % 26
-            decryptedText += indexToChar(newIndex)
-        else:
-            decryptedText += c  # If character is not in the alphabet, just append it as is
-    return decryptedText
+    return get_cipher(k1, k2).decrypt(text)
+
+def encrypt_many(messages, k1, k2):
+    """Encrypt a list or iterator of messages under one key pair; results are produced lazily."""
+    return map(get_cipher(k1, k2).encrypt, messages)
+
+def decrypt_many(messages, k1, k2):
+    """Decrypt a list or iterator of messages under one key pair; results are produced lazily."""
+    return map(get_cipher(k1, k2).decrypt, messages)
 
 def main():
     while True:
@@ -2,33 +2,18 @@ from utils import *
 
 str = read_from_file("encrypted.txt").upper()
 
+ngrams = count_ngrams(str)
+for n, name in [(2, "bigrams"), (3, "trigrams"), (4, "quadgrams")]:
+    print(f"Most common {name}:", ngrams.most_common(n, limit=10))
 
-str = substitute_letters(str, 'V', 'e')
-str = substitute_letters(str, 'W', 't')
-str = substitute_letters(str, 'Q', 'h')
-str = substitute_letters(str, 'T', 'a')
-str = substitute_letters(str, 'G', 'n')
-str = substitute_letters(str, 'X', 'i')
-str = substitute_letters(str, 'P', 's')
-str = substitute_letters(str, 'N', 'o')
-str = substitute_letters(str, 'O', 'd')
-str = substitute_letters(str, 'I', 'r')
-str = substitute_letters(str, 'L', 'k')
-str = substitute_letters(str, 'H', 'c')
-str = substitute_letters(str, 'J', 'g')
-str = substitute_letters(str, 'M', 'z')
-str = substitute_letters(str, 'Z', 'm')
-str = substitute_letters(str, 'U', 'p')
-str = substitute_letters(str, 'D', 'u')
-str = substitute_letters(str, 'F', 'y')
-str = substitute_letters(str, 'S', 'l')
-str = substitute_letters(str, 'K', 'v')
-str = substitute_letters(str, 'A', 'b')
-str = substitute_letters(str, 'R', 'w')
-str = substitute_letters(str, 'C', 'f')
-str = substitute_letters(str, 'Y', 'x')
-str = substitute_letters(str, 'B', 'q')
-str = substitute_letters(str, 'E', 'j')
+
+key = SubstitutionKey({
+    'V': 'e', 'W': 't', 'Q': 'h', 'T': 'a', 'G': 'n', 'X': 'i', 'P': 's',
+    'N': 'o', 'O': 'd', 'I': 'r', 'L': 'k', 'H': 'c', 'J': 'g', 'M': 'z',
+    'Z': 'm', 'U': 'p', 'D': 'u', 'F': 'y', 'S': 'l', 'K': 'v', 'A': 'b',
+    'R': 'w', 'C': 'f', 'Y': 'x', 'B': 'q', 'E': 'j'
+})
+str = key.apply(str)
 
 frequency = find_frequency(str)
 new_frequency = dict(sorted(frequency.items(), key=lambda x: x[1], reverse=True))
@@ -0,0 +1,145 @@
+"""
+Automatic solver for the monoalphabetic substitution cipher.
+
+Candidate keys are scored with quadgram log-probabilities and improved by simulated
+annealing over letter swaps, with independent restarts spread over a process pool.
+The ciphertext is reduced once to its distinct quadgrams, and for every cipher letter we
+keep the indexes of the quadgrams that contain it, so a swap only rescores those quadgrams.
+
+The quadgram statistics come from a reference English text given by the caller; it must be
+independent of the ciphertext (not its own decryption), or the result proves nothing.
+
+Example:
+    python solver.py encrypted.txt english_corpus.txt
+"""
+import argparse
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils import LETTERS, count_ngrams, english_language_letters_frequency, letter_indexes
+
+PLACES = np.array([26 ** 3, 26 ** 2, 26, 1], dtype=np.int64)
+
+
+def load_quadgram_scores(corpus_path):
+    """Return log10 probabilities of all 26**4 quadgrams, with a floor for unseen ones."""
+    with open(corpus_path, 'rb') as f:
+        counts = count_ngrams(f.read().upper(), orders=(4,)).counts[4]
+    total = max(int(counts.sum()), 1)
+    return np.where(counts > 0, np.log10(np.maximum(counts, 1) / total), math.log10(0.01 / total))
+
+
+def seed_key(ciphertext):
+    """
+    Initial key from frequency analysis: the n-th most frequent cipher letter is mapped to the
+    n-th most frequent letter of `english_language_letters_frequency`.
+    """
+    counts = np.bincount(letter_indexes(ciphertext), minlength=26)
+    cipher_order = np.argsort(-counts, kind='stable')
+    english_order = sorted(LETTERS, key=lambda c: -english_language_letters_frequency[c])
+    key = np.empty(26, dtype=np.int64)
+    for cipher_letter, plain_letter in zip(cipher_order, english_order):
+        key[cipher_letter] = LETTERS.index(plain_letter)
+    return key
+
+
+class QuadgramIndex:
+    """Distinct ciphertext quadgrams with their counts and, per cipher letter, where they occur."""
+
+    def __init__(self, ciphertext):
+        counts = count_ngrams(ciphertext, orders=(4,)).counts[4]
+        codes = np.flatnonzero(counts)
+        self.weights = counts[codes].astype(np.float64)
+        self.letters = (codes[:, None] // PLACES[None, :]) % 26
+        contains = [np.flatnonzero((self.letters == c).any(axis=1)) for c in range(26)]
+        self.affected = {(a, b): np.union1d(contains[a], contains[b])
+                         for a in range(26) for b in range(a + 1, 26)}
+
+    def scores(self, key, table):
+        """Score of every distinct quadgram under `key`."""
+        return table[key[self.letters] @ PLACES]
+
+
+def anneal(ciphertext, table, key, iterations=20000, temperature=20.0, seed=None):
+    """
+    Simulated annealing from `key`; returns (best key, best score).
+    Each step proposes swapping the plaintext letters of two cipher letters and only rescores
+    the quadgrams containing one of them.
+    """
+    rng = random.Random(seed)
+    index = QuadgramIndex(ciphertext)
+    key = key.copy()
+    current = index.scores(key, table)
+    score = float(np.dot(index.weights, current))
+    best_key, best_score = key.copy(), score
+    pairs = list(index.affected)
+    for step in range(iterations):
+        t = temperature * (1 - step / iterations) + 1e-9
+        a, b = rng.choice(pairs)
+        rows = index.affected[a, b]
+        if not len(rows):
+            continue
+        key[a], key[b] = key[b], key[a]
+        proposed = table[key[index.letters[rows]] @ PLACES]
+        delta = float(np.dot(index.weights[rows], proposed - current[rows]))
+        if delta >= 0 or rng.random() < math.exp(delta / t):
+            current[rows] = proposed
+            score += delta
+            if score > best_score:
+                best_key, best_score = key.copy(), score
+        else:
+            key[a], key[b] = key[b], key[a]
+    return best_key, best_score
+
+
+def _restart(args):
+    ciphertext, table, key, iterations, seed = args
+    if seed:
+        # every restart but the first starts from a randomly perturbed seed key
+        rng = random.Random(seed)
+        key = key.copy()
+        for _ in range(10):
+            a, b = rng.sample(range(26), 2)
+            key[a], key[b] = key[b], key[a]
+    return anneal(ciphertext, table, key, iterations, seed=seed)
+
+
+def solve(ciphertext, corpus_path, restarts=8, iterations=20000, workers=None):
+    """
+    Recover the substitution key of `ciphertext`, scoring candidates with quadgram statistics
+    of the English reference text at `corpus_path`.
+    Returns ({cipher letter: plaintext letter}, score), the score being the quadgram log-probability.
+    """
+    if isinstance(ciphertext, str):
+        ciphertext = ciphertext.upper().encode('ascii', 'ignore')
+    table = load_quadgram_scores(corpus_path)
+    key = seed_key(ciphertext)
+    jobs = [(ciphertext, table, key, iterations, seed) for seed in range(restarts)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        best_key, best_score = max(pool.map(_restart, jobs), key=lambda result: result[1])
+    return {LETTERS[c]: LETTERS[p].lower() for c, p in enumerate(best_key)}, best_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recover a monoalphabetic substitution key.")
+    parser.add_argument('ciphertext', help="file with the ciphertext")
+    parser.add_argument('corpus', help="independent English reference text for the quadgram statistics")
+    parser.add_argument('--restarts', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.ciphertext, 'rb') as f:
+        ciphertext = f.read().upper()
+    mapping, score = solve(ciphertext, args.corpus, args.restarts, args.iterations, args.workers)
+    print("Score:", round(score, 2))
+    for cipher_letter, plain_letter in mapping.items():
+        print(f"{cipher_letter} -> {plain_letter}")
+    print(ciphertext.decode('latin-1').translate(str.maketrans(mapping)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,38 @@
+import hashlib
+
 import streamlit as st
+from matplotlib import pyplot as plt
 from utils import *
 
 
-def try_decode(file_content, encodings=['utf-8', 'iso-8859-1', 'windows-1252']):
-    for encoding in encodings:
-        try:
-            return file_content.decode(encoding).upper()
-        except UnicodeDecodeError:
-            continue
-    return None
+def try_decode(file_content, encodings=ENCODINGS):
+    # The encoding is detected on a sample and the content decoded chunk by chunk
+    try:
+        return ''.join(iter_decoded(iter_views(file_content), encodings=encodings, upper=True))
+    except UnicodeDecodeError:
+        return None
+
+
+# Expensive results are cached by the SHA-256 of the upload; arguments starting with "_" are not hashed.
+@st.cache_data(max_entries=4)
+def decode_upload(content_hash, _file_content):
+    return try_decode(_file_content)
+
+
+@st.cache_resource(max_entries=4)
+def encrypted_ngrams(content_hash, _uploaded_file):
+    # ASCII letters are identical in every supported encoding, so the raw bytes can be counted
+    return count_ngrams(iter_views(_uploaded_file.getvalue()), fold_case=True)
+
+
+@st.cache_resource(max_entries=64)
+def letter_chart(items, figsize=None):
+    """Bar chart of (letter, value) pairs, rendered once per distinct content."""
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.bar([letter for letter, _ in items], [value for _, value in items])
+    ax.set_xlabel("Letters")
+    ax.set_ylabel("Frequency")
+    return fig
 
 
 st.title("Dynamic Interactive Letter Frequency Substitution Tool")
@@ -18,26 +42,28 @@ if 'encrypted_text' not in st.session_state:
     st.session_state.encrypted_text = ""
 if 'decrypted_text' not in st.session_state:
     st.session_state.decrypted_text = ""
-if 'substitution_history' not in st.session_state:
-    st.session_state.substitution_history = []
-if 'unused' not in st.session_state:
-    st.session_state.unused = unused.copy()
-if 'previous_states' not in st.session_state:
-    st.session_state.previous_states = []  # Store previous states for undo
+if 'key' not in st.session_state:
+    st.session_state.key = SubstitutionKey()  # Mapping deltas double as the undo history
 
 # File uploader for the encrypted text file
 uploaded_file = st.file_uploader("Upload Encrypted File", type=["txt"])
 
 if uploaded_file is not None:
-    # Read and display the uploaded encrypted text
-    file_content = uploaded_file.read()
-    st.session_state.encrypted_text = try_decode(file_content)
+    # Read and decode the upload only when a new file arrives
+    if st.session_state.get('file_id') != uploaded_file.file_id:
+        file_content = uploaded_file.getvalue()
+        st.session_state.file_id = uploaded_file.file_id
+        st.session_state.content_hash = hashlib.sha256(file_content).hexdigest()
+        encrypted_ngrams(st.session_state.content_hash, uploaded_file)
+        st.session_state.encrypted_text = decode_upload(st.session_state.content_hash, file_content)
+        st.session_state.decrypted_text = ""
 
     if st.session_state.encrypted_text is None:
         st.error("Unable to decode the file. Please check the file encoding.")
     else:
+        key = st.session_state.key
         if not st.session_state.decrypted_text:
-            st.session_state.decrypted_text = st.session_state.encrypted_text
+            st.session_state.decrypted_text = key.apply(st.session_state.encrypted_text)
         st.write("### Encrypted Text:")
         st.text_area("Encrypted Text", st.session_state.encrypted_text, height=200)
 
@@ -50,30 +76,13 @@ if uploaded_file is not None:
         with col3:
             if st.button("Apply Substitution"):
                 if old_letter and new_letter:
-                    # Save current state for undo
-                    st.session_state.previous_states.append({
-                        "decrypted_text": st.session_state.decrypted_text,
-                        "substitution_history": st.session_state.substitution_history.copy(),
-                        "unused": st.session_state.unused.copy(),
-                    })
-
-                    # Update decrypted text
-                    st.session_state.decrypted_text = substitute_letters(st.session_state.decrypted_text, old_letter,
-                                                                         new_letter)
-
-                    # Append to substitution history
-                    st.session_state.substitution_history.append(f"{old_letter} -> {new_letter}")
-
-                    # Remove new letter from unused list
-                    if new_letter.upper() in st.session_state.unused:
-                        del st.session_state.unused[new_letter.upper()]
-
-        # Undo button to revert to the last state
-        if st.button("Undo Last Substitution") and st.session_state.previous_states:
-            last_state = st.session_state.previous_states.pop()  # Restore last saved state
-            st.session_state.decrypted_text = last_state["decrypted_text"]
-            st.session_state.substitution_history = last_state["substitution_history"]
-            st.session_state.unused = last_state["unused"]
+                    # Compose into the key and re-decrypt the original ciphertext in one pass
+                    key.substitute(old_letter, new_letter)
+                    st.session_state.decrypted_text = key.apply(st.session_state.encrypted_text)
+
+        # Undo button to revert the last mapping change
+        if st.button("Undo Last Substitution") and key.undo():
+            st.session_state.decrypted_text = key.apply(st.session_state.encrypted_text)
 
         # Show the decrypted text
         st.write("### Decrypted Text:")
@@ -81,37 +90,33 @@ if uploaded_file is not None:
 
         # Display substitution history
         st.write("### Substitution History:")
-        for substitution in st.session_state.substitution_history:
+        for substitution in key.substitutions():
             st.write(substitution)
 
-        # Calculate frequencies
-        decrypted_frequency = find_frequency(st.session_state.decrypted_text)
+        # The decrypted text still shows the unmapped cipher letters, so its frequencies
+        # follow from the ciphertext counts and the key without rescanning the text
+        ngrams = encrypted_ngrams(st.session_state.content_hash, uploaded_file)
+        decrypted_frequency = key.remaining_frequency(ngrams.frequency(1))
 
         st.write("### Letter Frequencies:")
         col1, col2 = st.columns(2)
 
         with col1:
             st.write("Decrypted Text")
-            fig1, ax1 = plt.subplots()
-            ax1.bar(decrypted_frequency.keys(), decrypted_frequency.values())
-            ax1.set_xlabel("Letters")
-            ax1.set_ylabel("Frequency")
-            st.pyplot(fig1)
+            st.pyplot(letter_chart(tuple(decrypted_frequency.items())))
 
         with col2:
             st.write("Unused Letters")
-            fig2, ax2 = plt.subplots()
-            ax2.bar(st.session_state.unused.keys(), st.session_state.unused.values())
-            ax2.set_xlabel("Letters")
-            ax2.set_ylabel("Frequency")
-            st.pyplot(fig2)
+            st.pyplot(letter_chart(tuple(key.unused().items())))
+
+        st.write("### Most Common N-grams in the Encrypted Text:")
+        for column, n in zip(st.columns(3), (2, 3, 4)):
+            with column:
+                for ngram, count in ngrams.most_common(n, limit=10):
+                    st.write(f"{ngram}: {count}")
 
         st.write("### English Language Letter Frequency")
-        fig3, ax3 = plt.subplots(figsize=(10, 5))
-        ax3.bar(english_language_letters_frequency.keys(), english_language_letters_frequency.values())
-        ax3.set_xlabel("Letters")
-        ax3.set_ylabel("Frequency")
-        st.pyplot(fig3)
+        st.pyplot(letter_chart(tuple(english_language_letters_frequency.items()), figsize=(10, 5)))
 
         # Download button for decrypted text
         st.download_button("Download Decrypted Text", st.session_state.decrypted_text, file_name="decrypted.txt")
\ No newline at end of file
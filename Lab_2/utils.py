@@ -1,5 +1,9 @@
-<<<<<<< HEAD
-from matplotlib import pyplot as plt
+import codecs
+import itertools
+import mmap
+from contextlib import contextmanager
+
+import numpy as np
 unused = {
     'E': 12.02, 'T': 9.10, 'A': 8.12, 'H': 5.92, 'I': 7.31, 'N': 6.95, 'S': 6.28, 'O': 7.68, 'R': 6.02,
     'D': 4.32, 'L': 3.98, 'U': 2.88, 'C': 2.71, 'M': 2.61, 'F': 2.30, 'Y': 2.11, 'W': 2.09, 'G': 2.03,
@@ -10,87 +14,281 @@ english_language_letters_frequency = {
     'D': 4.32, 'L': 3.98, 'U': 2.88, 'C': 2.71, 'M': 2.61, 'F': 2.30, 'Y': 2.11, 'W': 2.09, 'G': 2.03,
     'P': 1.82, 'B': 1.49, 'V': 1.11, 'K': 0.69, 'X': 0.17, 'Q': 0.11, 'J': 0.10, 'Z': 0.07
 }
-def find_frequency(text):
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ENCODINGS = ('utf-8', 'windows-1252', 'iso-8859-1')  # iso-8859-1 accepts any byte, so it is the last resort
+SAMPLE_SIZE = 1 << 16  # bytes used to detect the encoding
+CHUNK_SIZE = 4 << 20  # bytes handed to the analysis per chunk
+
+
+def letter_indexes(text, fold_case=False):
     """
-    Find the frequency of each letter in the text.
+    Return the A-Z letters of `text` as a uint8 array of indexes 0-25; every other character is skipped.
+    `text` may be a str or any bytes-like object (bytes-like input is viewed without copying).
+    With `fold_case`, a-z count as A-Z, which lets raw file bytes be analysed without upper-casing them.
     """
-    frequency = {}
-    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    for char in text:
-        if char in letters:
-            if char.upper() in frequency:
-                frequency[char.upper()] += 1
-            else:
-                frequency[char.upper()] = 1
-    return frequency
-def plot_frequency(frequency, label):
+    if isinstance(text, str):
+        text = text.encode('ascii', 'ignore')
+    data = np.frombuffer(text, dtype=np.uint8)
+    if fold_case:
+        # clearing bit 5 maps a-z onto A-Z; no other byte lands in the A-Z range
+        data = data & 0xDF
+    return data[(data >= ord('A')) & (data <= ord('Z'))] - ord('A')
+
+
+class NgramCounter:
     """
-    Plot the frequency of each letter in the text.
+    Count unigrams, bigrams, trigrams and quadgrams of A-Z letters in one pass per chunk.
+    Chunks can be fed one at a time with `update`; the last letters of each chunk are carried
+    over so n-grams crossing a chunk edge are counted exactly once.
     """
-    plt.bar(frequency.keys(), frequency.values())
-    plt.ylabel(label)
-    plt.show()
-def substitute_letters(text, original_letter, new_letter):
+
+    def __init__(self, orders=(1, 2, 3, 4), fold_case=False):
+        self.orders = tuple(orders)
+        self.fold_case = fold_case
+        self.counts = {n: np.zeros(26 ** n, dtype=np.int64) for n in self.orders}
+        self.tail = np.empty(0, dtype=np.uint8)
+
+    def update(self, chunk):
+        letters = letter_indexes(chunk, self.fold_case)
+        if not len(letters):
+            return self
+        joined = np.concatenate([self.tail, letters]).astype(np.int64)
+        for n in self.orders:
+            if len(joined) < n:
+                continue
+            width = len(joined) - n + 1
+            codes = joined[:width].copy()
+            for k in range(1, n):
+                codes *= 26
+                codes += joined[k:k + width]
+            # n-grams lying entirely inside the carried tail were counted with the previous chunk
+            codes = codes[max(0, len(self.tail) - n + 1):]
+            self.counts[n] += np.bincount(codes, minlength=26 ** n)
+        keep = max(self.orders) - 1
+        self.tail = joined[max(0, len(joined) - keep):].astype(np.uint8) if keep else self.tail
+        return self
+
+    def frequency(self, n=1):
+        """Return {ngram: count} for the n-grams that occur at least once."""
+        counts = self.counts[n]
+        return {decode_ngram(code, n): int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def most_common(self, n=1, limit=10):
+        """Return the `limit` most frequent n-grams as (ngram, count) pairs."""
+        counts = self.counts[n]
+        top = np.argsort(counts, kind='stable')[::-1][:limit]
+        return [(decode_ngram(code, n), int(counts[code])) for code in top if counts[code]]
+
+
+def decode_ngram(code, n):
+    """Turn an n-gram index back into its letters."""
+    letters = []
+    for _ in range(n):
+        code, index = divmod(int(code), 26)
+        letters.append(LETTERS[index])
+    return ''.join(reversed(letters))
+
+
+def count_ngrams(chunks, orders=(1, 2, 3, 4), fold_case=False):
     """
-    Update unused letters from original english alphabet.
-    Substitute the original letter with the new letter in the text.
+    Count n-grams over a text, bytes object or an iterable of chunks.
+    A single text or bytes object is fed in slices of CHUNK_SIZE, so the temporary arrays stay
+    bounded by the slice size instead of growing with the whole input.
     """
-    if new_letter.upper() in unused:
-        del unused[new_letter.upper()]
-    return text.replace(original_letter, new_letter)
-def write_to_file(text, filename):
-    """Using this for writing the text to a special file."""
-    with open(filename, 'w') as file:
-        file.write(text)
-def read_from_file(filename):
-    """Using this for reading the text from a special file."""
-    with open(filename, 'r') as file:
-=======
-from matplotlib import pyplot as plt
-unused = {
-    'E': 12.02, 'T': 9.10, 'A': 8.12, 'H': 5.92, 'I': 7.31, 'N': 6.95, 'S': 6.28, 'O': 7.68, 'R': 6.02,
-    'D': 4.32, 'L': 3.98, 'U': 2.88, 'C': 2.71, 'M': 2.61, 'F': 2.30, 'Y': 2.11, 'W': 2.09, 'G': 2.03,
-    'P': 1.82, 'B': 1.49, 'V': 1.11, 'K': 0.69, 'X': 0.17, 'Q': 0.11, 'J': 0.10, 'Z': 0.07
-}
-english_language_letters_frequency = {
-    'E': 12.02, 'T': 9.10, 'A': 8.12, 'H': 5.92, 'I': 7.31, 'N': 6.95, 'S': 6.28, 'O': 7.68, 'R': 6.02,
-    'D': 4.32, 'L': 3.98, 'U': 2.88, 'C': 2.71, 'M': 2.61, 'F': 2.30, 'Y': 2.11, 'W': 2.09, 'G': 2.03,
-    'P': 1.82, 'B': 1.49, 'V': 1.11, 'K': 0.69, 'X': 0.17, 'Q': 0.11, 'J': 0.10, 'Z': 0.07
-}
+    counter = NgramCounter(orders, fold_case)
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = memoryview(chunks).cast('B')
+    if isinstance(chunks, (str, memoryview)):
+        data = chunks
+        chunks = (data[start:start + CHUNK_SIZE] for start in range(0, len(data), CHUNK_SIZE))
+    for chunk in chunks:
+        counter.update(chunk)
+    return counter
+
+
 def find_frequency(text):
     """
     Find the frequency of each letter in the text.
     """
-    frequency = {}
-    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    for char in text:
-        if char in letters:
-            if char.upper() in frequency:
-                frequency[char.upper()] += 1
-            else:
-                frequency[char.upper()] = 1
-    return frequency
+    return count_ngrams(text, orders=(1,)).frequency(1)
 def plot_frequency(frequency, label):
     """
     Plot the frequency of each letter in the text.
     """
+    # imported here so that counting frequencies does not pay matplotlib's start-up cost
+    from matplotlib import pyplot as plt
     plt.bar(frequency.keys(), frequency.values())
     plt.ylabel(label)
     plt.show()
 def substitute_letters(text, original_letter, new_letter):
     """
-    Update unused letters from original english alphabet.
     Substitute the original letter with the new letter in the text.
+    Use SubstitutionKey to apply many substitutions in one pass.
     """
-    if new_letter.upper() in unused:
-        del unused[new_letter.upper()]
     return text.replace(original_letter, new_letter)
+
+
+class SubstitutionKey:
+    """
+    Letter substitutions composed into a single mapping {cipher letter: plaintext letter},
+    applied to the original ciphertext with one `str.translate` pass.
+    Every change is recorded as a delta (cipher letter, previous letter, new letter), so the undo
+    history costs O(1) per step instead of a copy of the text.
+    """
+
+    def __init__(self, mapping=None):
+        self.mapping = {}
+        self.history = []
+        self.table = None
+        for original_letter, new_letter in (mapping or {}).items():
+            self.substitute(original_letter, new_letter)
+
+    def substitute(self, original_letter, new_letter):
+        """Map the cipher letter `original_letter` to `new_letter`, replacing any earlier choice."""
+        original_letter, new_letter = original_letter.upper(), new_letter.lower()
+        self.history.append((original_letter, self.mapping.get(original_letter), new_letter))
+        self.mapping[original_letter] = new_letter
+        self.table = None
+
+    def undo(self):
+        """Revert the last substitution; returns False when there is nothing to undo."""
+        if not self.history:
+            return False
+        original_letter, previous_letter, _ = self.history.pop()
+        if previous_letter is None:
+            del self.mapping[original_letter]
+        else:
+            self.mapping[original_letter] = previous_letter
+        self.table = None
+        return True
+
+    def apply(self, text):
+        """Decrypt the original ciphertext with every substitution at once."""
+        if self.table is None:
+            self.table = str.maketrans(self.mapping)
+        return text.translate(self.table)
+
+    def unused(self):
+        """English letters (with their frequency) not yet used as a substitution."""
+        used = {letter.upper() for letter in self.mapping.values()}
+        return {letter: frequency for letter, frequency in english_language_letters_frequency.items()
+                if letter not in used}
+
+    def remaining_frequency(self, cipher_frequency):
+        """
+        Letter frequencies of the decrypted text given those of the ciphertext: mapped letters become
+        lowercase and drop out, so this costs O(26) instead of a rescan of the text.
+        """
+        return {letter: count for letter, count in cipher_frequency.items() if letter not in self.mapping}
+
+    def substitutions(self):
+        """The applied substitutions, oldest first, as 'X -> y' strings."""
+        return [f"{original_letter} -> {new_letter}" for original_letter, _, new_letter in self.history]
+@contextmanager
+def map_file(filename):
+    """Memory-map a file read-only and yield it as a memoryview (empty files yield an empty view)."""
+    with open(filename, 'rb') as file:
+        if not file.seek(0, 2):
+            yield memoryview(b'')
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def iter_views(data, chunk_size=CHUNK_SIZE):
+    """
+    Yield zero-copy slices of a bytes-like object. Each slice is released once the consumer asks
+    for the next one, so it must not be kept around (copy it with bytes() if needed).
+    """
+    with memoryview(data) as view:
+        for start in range(0, len(view), chunk_size):
+            with view[start:start + chunk_size] as piece:
+                yield piece
+
+
+def detect_encoding(data, encodings=ENCODINGS, sample_size=SAMPLE_SIZE):
+    """
+    Return the first encoding whose incremental decoder accepts the first `sample_size` bytes,
+    or None. The decoders are not finalised, so a character cut by the sample edge is fine.
+    """
+    sample = bytes(memoryview(data)[:sample_size])
+    for encoding in encodings:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def iter_decoded(chunks, encoding=None, encodings=ENCODINGS, upper=False):
+    """
+    Decode an iterable of byte chunks incrementally and yield str chunks.
+    `encoding` defaults to the one detected on the first chunk. If a later chunk is invalid in it,
+    decoding switches to the next candidate from that chunk on, so earlier chunks are not redone.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return
+    if encoding is None:
+        encoding = detect_encoding(first, encodings)
+        if encoding is None:
+            raise UnicodeDecodeError('unknown', bytes(first[:1]), 0, 1, "no candidate encoding matches")
+    fallbacks = list(encodings[encodings.index(encoding) + 1:]) if encoding in encodings else []
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in itertools.chain([first], chunks):
+        while True:
+            try:
+                text = decoder.decode(chunk)
+                break
+            except UnicodeDecodeError:
+                if not fallbacks:
+                    raise
+                # keep the bytes the failed decoder was holding back from the previous chunk
+                chunk = decoder.getstate()[0] + bytes(chunk)
+                decoder = codecs.getincrementaldecoder(fallbacks.pop(0))()
+        yield text.upper() if upper else text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text.upper() if upper else text
+
+
+def decode_text(data, encodings=ENCODINGS):
+    """Decode a whole bytes-like object chunk by chunk; returns None when no encoding fits."""
+    try:
+        return ''.join(iter_decoded(iter_views(data), encodings=encodings))
+    except UnicodeDecodeError:
+        return None
+
+
+def file_frequency(filename, orders=(1,)):
+    """
+    Count the n-grams of a file of any size straight from the memory map. ASCII letters are the
+    same bytes in every supported encoding, so nothing has to be decoded or upper-cased first.
+    """
+    counter = NgramCounter(orders, fold_case=True)
+    with map_file(filename) as data:
+        for view in iter_views(data):
+            counter.update(view)
+    return counter
+
+
 def write_to_file(text, filename):
     """Using this for writing the text to a special file."""
     with open(filename, 'w') as file:
         file.write(text)
 def read_from_file(filename):
-    """Using this for reading the text from a special file."""
-    with open(filename, 'r') as file:
->>>>>>> 005f4817a22110345dfb153403fbc2e9ea0c0e0b
-        return file.read()
\ No newline at end of file
+    """Using this for reading the text from a special file, whatever its encoding."""
+    with map_file(filename) as data:
+        return ''.join(iter_decoded(iter_views(data)))
+
+
+def iter_file_text(filename, upper=True, chunk_size=CHUNK_SIZE):
+    """Yield the decoded text of a file chunk by chunk, without loading the whole file."""
+    with map_file(filename) as data:
+        yield from iter_decoded(iter_views(data, chunk_size), upper=upper)
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Key recovery for the 6x5 Playfair cipher by simulated annealing.
+
+A candidate key is the 6x5 matrix as an array of 30 letter indexes. Each step swaps two
+letters, two rows or two columns, decrypts the ciphertext through the candidate's digraph
+table and scores the plaintext with quadgram log-probabilities. Everything on the hot path
+is array indexing: the 30x30 digraph table is rebuilt with NumPy for the distinct ciphertext
+digraphs only, and quadgram scores come from a flat array of 30**4 entries.
+
+Independent restarts run on a process pool. Finished restarts are written to a checkpoint
+file, so an interrupted search resumes where it stopped.
+
+Example:
+    python crack.py ciphertext.txt corpus_ro.txt --restarts 16 --checkpoint search.json
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from main import PLAYFAIR_LETTERS, create_cipher_matrix, normalize_stream, read_chunks
+
+SIZE = len(PLAYFAIR_LETTERS)  # 30 cells, 6 rows x 5 columns
+ROWS, COLUMNS = 6, 5
+LETTER_INDEX = {char: i for i, char in enumerate(PLAYFAIR_LETTERS)}
+
+
+def to_indexes(letters):
+    """Turn normalised letters into an array of indexes into PLAYFAIR_LETTERS."""
+    return np.fromiter((LETTER_INDEX[c] for c in letters), dtype=np.int64, count=len(letters))
+
+
+def load_quadgram_scores(corpus_path):
+    """
+    Return log10 quadgram probabilities over the 30-letter alphabet as a flat array of 30**4
+    entries, trained on a Romanian or English reference text. Unseen quadgrams get a floor.
+    """
+    counts = np.zeros(SIZE ** 4, dtype=np.int64)
+    tail = np.empty(0, dtype=np.int64)
+    for letters in normalize_stream(read_chunks(corpus_path)):
+        joined = np.concatenate([tail, to_indexes(letters)])
+        if len(joined) >= 4:
+            codes = ((joined[:-3] * SIZE + joined[1:-2]) * SIZE + joined[2:-1]) * SIZE + joined[3:]
+            counts += np.bincount(codes, minlength=SIZE ** 4)
+        tail = joined[-3:]
+    total = max(int(counts.sum()), 1)
+    return np.where(counts > 0, np.log10(np.maximum(counts, 1) / total), math.log10(0.01 / total))
+
+
+class Ciphertext:
+    """Ciphertext reduced to its distinct digraphs, with the mapping back to every position."""
+
+    def __init__(self, text):
+        letters = ''.join(normalize_stream([text]))
+        if len(letters) % 2:
+            raise ValueError("Ciphertext has an odd number of letters.")
+        indexes = to_indexes(letters)
+        digraphs = indexes[0::2] * SIZE + indexes[1::2]
+        unique, self.inverse = np.unique(digraphs, return_inverse=True)
+        self.first, self.second = unique // SIZE, unique % SIZE
+
+    def decrypt(self, grid):
+        """Decrypt under the matrix `grid` (30 letter indexes, row-major) into letter indexes."""
+        position = np.empty(SIZE, dtype=np.int64)
+        position[grid] = np.arange(SIZE)
+        row1, col1 = np.divmod(position[self.first], COLUMNS)
+        row2, col2 = np.divmod(position[self.second], COLUMNS)
+        same_row = row1 == row2
+        same_col = (col1 == col2) & ~same_row
+        out_row1 = np.where(same_col, (row1 - 1) % ROWS, row1)
+        out_row2 = np.where(same_col, (row2 - 1) % ROWS, row2)
+        out_col1 = np.where(same_row, (col1 - 1) % COLUMNS, np.where(same_col, col1, col2))
+        out_col2 = np.where(same_row, (col2 - 1) % COLUMNS, np.where(same_col, col2, col1))
+        # digraph table for the distinct ciphertext digraphs, expanded to every position
+        plaintext = np.empty(2 * len(self.inverse), dtype=np.int64)
+        plaintext[0::2] = grid[out_row1 * COLUMNS + out_col1][self.inverse]
+        plaintext[1::2] = grid[out_row2 * COLUMNS + out_col2][self.inverse]
+        return plaintext
+
+
+def score(plaintext, table):
+    codes = ((plaintext[:-3] * SIZE + plaintext[1:-2]) * SIZE + plaintext[2:-1]) * SIZE + plaintext[3:]
+    return float(table[codes].sum())
+
+
+def mutate(grid, rng):
+    """Return a copy of `grid` with two letters, two rows or two columns swapped."""
+    grid = grid.copy()
+    move = rng.random()
+    if move < 0.9:
+        i, j = rng.sample(range(SIZE), 2)
+        grid[i], grid[j] = grid[j], grid[i]
+    elif move < 0.95:
+        matrix = grid.reshape(ROWS, COLUMNS)
+        i, j = rng.sample(range(ROWS), 2)
+        matrix[[i, j]] = matrix[[j, i]]
+    else:
+        matrix = grid.reshape(ROWS, COLUMNS)
+        i, j = rng.sample(range(COLUMNS), 2)
+        matrix[:, [i, j]] = matrix[:, [j, i]]
+    return grid
+
+
+def anneal(ciphertext, table, seed, iterations=50000, temperature=20.0):
+    """One restart from a random matrix; returns (best key as a 30-letter string, best score)."""
+    rng = random.Random(seed)
+    grid = np.array(rng.sample(range(SIZE), SIZE), dtype=np.int64)
+    current = score(ciphertext.decrypt(grid), table)
+    best_grid, best_score = grid, current
+    for step in range(iterations):
+        t = temperature * (1 - step / iterations) + 1e-9
+        candidate = mutate(grid, rng)
+        candidate_score = score(ciphertext.decrypt(candidate), table)
+        delta = candidate_score - current
+        if delta >= 0 or rng.random() < math.exp(delta / t):
+            grid, current = candidate, candidate_score
+            if current > best_score:
+                best_grid, best_score = grid, current
+    return ''.join(PLAYFAIR_LETTERS[i] for i in best_grid), best_score
+
+
+_worker_state = {}
+
+
+def _init_worker(text, table):
+    _worker_state['ciphertext'] = Ciphertext(text)
+    _worker_state['table'] = table
+
+
+def _run_restart(seed, iterations, temperature):
+    return seed, anneal(_worker_state['ciphertext'], _worker_state['table'], seed, iterations, temperature)
+
+
+def search_fingerprint(text, corpus_path, iterations, temperature):
+    """
+    Identify a search by its normalised ciphertext, corpus content and annealing parameters, so a
+    checkpoint is only reused for the very same search.
+    """
+    digest = hashlib.sha256()
+    digest.update(''.join(normalize_stream([text])).encode('utf-8'))
+    with open(corpus_path, 'rb') as file:
+        corpus_digest = hashlib.file_digest(file, 'sha256').hexdigest()
+    digest.update(json.dumps([corpus_digest, iterations, temperature]).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_checkpoint(path, fingerprint):
+    """Return {seed: (key, score)} of the restarts already finished in the same search."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    if data.get('fingerprint') != fingerprint:
+        raise ValueError("Checkpoint belongs to a different ciphertext, corpus or annealing parameters.")
+    return {int(seed): (entry['key'], entry['score']) for seed, entry in data['restarts'].items()}
+
+
+def save_checkpoint(path, fingerprint, results):
+    """Write the finished restarts atomically, so a crash never leaves a half-written file."""
+    data = {'fingerprint': fingerprint,
+            'restarts': {str(seed): {'key': key, 'score': value} for seed, (key, value) in results.items()}}
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def recover_key(text, corpus_path, restarts=8, iterations=50000, temperature=20.0,
+                checkpoint=None, workers=None):
+    """
+    Search for the Playfair matrix of `text`. Returns (key, score) of the best restart; the key
+    is the matrix read row by row, usable directly with encrypt_message/decrypt_message.
+    """
+    fingerprint = search_fingerprint(text, corpus_path, iterations, temperature)
+    results = load_checkpoint(checkpoint, fingerprint)
+    table = load_quadgram_scores(corpus_path)
+    pending = [seed for seed in range(restarts) if seed not in results]
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(text, table)) as pool:
+            futures = [pool.submit(_run_restart, seed, iterations, temperature) for seed in pending]
+            for future in as_completed(futures):
+                seed, result = future.result()
+                results[seed] = result
+                print(f"Restart {seed}: score {result[1]:.2f}, key {result[0]}")
+                if checkpoint:
+                    save_checkpoint(checkpoint, fingerprint, results)
+    return max((results[seed] for seed in range(restarts)), key=lambda result: result[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recover a 6x5 Playfair key by simulated annealing.")
+    parser.add_argument('ciphertext', help="file with the ciphertext")
+    parser.add_argument('corpus', help="reference text (Romanian or English) for the quadgram statistics")
+    parser.add_argument('--restarts', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=50000)
+    parser.add_argument('--temperature', type=float, default=20.0)
+    parser.add_argument('--checkpoint', help="JSON file used to save and resume finished restarts")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.ciphertext, 'r', encoding='utf-8') as file:
+        text = file.read()
+    key, best = recover_key(text, args.corpus, args.restarts, args.iterations, args.temperature,
+                            args.checkpoint, args.workers)
+    print("Best score:", round(best, 2))
+    for row in create_cipher_matrix(key):
+        print(' '.join(row))
+
+
+if __name__ == "__main__":
+    main()
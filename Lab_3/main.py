@@ -1,35 +1,74 @@
+import operator
+import re
 import string
+from functools import lru_cache
+
+ROMANIAN_LETTERS = 'ȘȚĂÎÂ'
+PLAYFAIR_LETTERS = string.ascii_uppercase.replace('J', '') + ROMANIAN_LETTERS
+# Cedilla variants of Ș/Ț are still common in Romanian text; J has no cell in the matrix
+NORMALIZATION = str.maketrans({'Ş': 'Ș', 'Ţ': 'Ț', 'J': 'I'})
+NON_LETTERS = re.compile(f"[^{PLAYFAIR_LETTERS}]+")
+ODD_PADDING = 'X'  # appended to an odd number of letters; X as last letter means drop one
+EVEN_PADDING = 'XZ'  # appended to an even number of letters; Z as last letter means drop two
+CHUNK_SIZE = 1 << 20  # characters read per iteration in the streaming mode
+KEY_CACHE_SIZE = 256  # compiled keys kept alive by get_playfair_key
+
+def normalize_text(text):
+    """
+    Upper-case the text, fold the Romanian letter variants (and J into I) and drop everything that
+    has no cell in the matrix.
+    """
+    return NON_LETTERS.sub('', text.upper().translate(NORMALIZATION))
+
+def pad_letters(letters):
+    """
+    Always pad the letters to an even length (ODD_PADDING or EVEN_PADDING), so that the padding
+    can be told apart from real X's and removed exactly after decryption.
+    """
+    return letters + (ODD_PADDING if len(letters) % 2 else EVEN_PADDING)
+
+def remove_padding(plaintext):
+    """Inverse of pad_letters on decrypted letters (only the last two letters are looked at)."""
+    if plaintext.endswith(ODD_PADDING):
+        return plaintext[:-1]
+    if plaintext.endswith(EVEN_PADDING):
+        return plaintext[:-2]
+    raise ValueError("Ciphertext does not end with valid padding.")
 
 def prepare_text(text):
     """
-    Prepare the plaintext for encryption by converting it to uppercase, removing non-alphabetic characters,
-    and splitting it into pairs of letters.
+    Prepare the plaintext for encryption: normalize it, pad it and split it into pairs of letters.
+    """
+    return list(split_pairs(pad_letters(normalize_text(text))))
+
+def normalize_key(key):
+    """
+    Reduce a key to the letters that shape the matrix: normalized like the text (normalize_text),
+    without duplicates. Keys that normalize to the same string produce the same matrix.
     """
-    text = ''.join(c for c in text.upper() if c in string.ascii_letters + 'ȘȚĂÎÂ')
-    text = [text[i:i+2] for i in range(0, len(text), 2)]
-    if len(text[-1]) == 1:
-        text[-1] += 'X'
-    return text
+    return ''.join(dict.fromkeys(normalize_text(key)))  # Remove duplicate letters
 
 def create_cipher_matrix(key):
     """
     Construct the 6x5 cipher matrix from the given key.
     """
-    key = ''.join(c for c in key.upper() if c in string.ascii_letters + 'ȘȚĂÎÂ')
-    key = ''.join(dict.fromkeys(key))  # Remove duplicate letters
-    alphabet = [c for c in string.ascii_uppercase + 'ȘȚĂÎÂ' if c != 'J']
-    matrix = []
-    for char in key + ''.join(alphabet):
-        if char not in matrix:
-            matrix.append(char)
+    matrix = list(dict.fromkeys(normalize_key(key) + PLAYFAIR_LETTERS))  # key first, then the rest
+    assert len(matrix) == 30, "the key must only contain letters of the 6x5 matrix"
     return [matrix[i:i+5] for i in range(0, len(matrix), 5)]
 
-def encrypt_pair(pair, matrix):
+def letter_positions(matrix):
+    """
+    Map every letter of the cipher matrix to its (row, column).
+    """
+    return {char: (i, j) for i, row in enumerate(matrix) for j, char in enumerate(row)}
+
+def encrypt_pair(pair, matrix, positions=None):
     """
     Encrypt a pair of letters using the Playfair cipher algorithm.
     """
-    row1, col1 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[0])
-    row2, col2 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[1])
+    positions = positions or letter_positions(matrix)
+    row1, col1 = positions[pair[0]]
+    row2, col2 = positions[pair[1]]
 
     if row1 == row2:
         return matrix[row1][(col1 + 1) % 5] + matrix[row2][(col2 + 1) % 5]
@@ -38,22 +77,60 @@ def encrypt_pair(pair, matrix):
     else:
         return matrix[row1][col2] + matrix[row2][col1]
 
+class PlayfairKey:
+    """
+    Playfair key compiled from create_cipher_matrix: the position of every letter and the result of
+    every one of the 30x30 digraphs in both directions, so a pair costs a single dict lookup.
+    """
+
+    def __init__(self, key):
+        self.matrix = create_cipher_matrix(key)
+        self.positions = letter_positions(self.matrix)
+        self.encrypt_table = {}
+        self.decrypt_table = {}
+        for a in self.positions:
+            for b in self.positions:
+                self.encrypt_table[a + b] = encrypt_pair(a + b, self.matrix, self.positions)
+                self.decrypt_table[a + b] = decrypt_pair(a + b, self.matrix, self.positions)
+
+    def encrypt_pairs(self, pairs):
+        return ''.join(map(self.encrypt_table.__getitem__, pairs))
+
+    def decrypt_pairs(self, pairs):
+        return ''.join(map(self.decrypt_table.__getitem__, pairs))
+
+    def encrypt(self, plaintext):
+        return self.encrypt_pairs(prepare_text(plaintext))
+
+    def decrypt(self, ciphertext):
+        letters = normalize_text(ciphertext)
+        if len(letters) % 2:
+            raise ValueError("Ciphertext has an odd number of letters.")
+        return remove_padding(self.decrypt_pairs(split_pairs(letters)))
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compiled_key(normalized_key):
+    return PlayfairKey(normalized_key)
+
+def get_playfair_key(key):
+    """
+    Return the compiled key, built once per normalized key and kept in a bounded LRU cache.
+    """
+    return _compiled_key(normalize_key(key))
+
 def encrypt_message(plaintext, key):
     """
     Encrypt the plaintext using the Playfair cipher algorithm with the given key.
     """
-    matrix = create_cipher_matrix(key)
-    ciphertext = []
-    for pair in prepare_text(plaintext):
-        ciphertext.append(encrypt_pair(pair, matrix))
-    return ''.join(ciphertext)
+    return get_playfair_key(key).encrypt(plaintext)
 
-def decrypt_pair(pair, matrix):
+def decrypt_pair(pair, matrix, positions=None):
     """
     Decrypt a pair of letters using the Playfair cipher algorithm.
     """
-    row1, col1 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[0])
-    row2, col2 = next((i, j) for i in range(6) for j in range(5) if matrix[i][j] == pair[1])
+    positions = positions or letter_positions(matrix)
+    row1, col1 = positions[pair[0]]
+    row2, col2 = positions[pair[1]]
 
     if row1 == row2:
         return matrix[row1][(col1 - 1) % 5] + matrix[row2][(col2 - 1) % 5]
@@ -66,11 +143,103 @@ def decrypt_message(ciphertext, key):
     """
     Decrypt the ciphertext using the Playfair cipher algorithm with the given key.
     """
-    matrix = create_cipher_matrix(key)
-    plaintext = []
-    for pair in [ciphertext[i:i+2] for i in range(0, len(ciphertext), 2)]:
-        plaintext.append(decrypt_pair(pair, matrix))
-    return ''.join(plaintext).replace('X', '')
+    return get_playfair_key(key).decrypt(ciphertext)
+
+def _process_many(items, operation):
+    """
+    Group (message, key) pairs by normalized key, run each group through its compiled key in one
+    loop and return the results in input order.
+    """
+    items = list(items)
+    groups = {}
+    for index, (_, key) in enumerate(items):
+        groups.setdefault(normalize_key(key), []).append(index)
+    results = [None] * len(items)
+    for normalized_key, indexes in groups.items():
+        process = operation(_compiled_key(normalized_key))
+        for index in indexes:
+            results[index] = process(items[index][0])
+    return results
+
+def encrypt_many(items):
+    """
+    Encrypt many (plaintext, key) pairs; each distinct key is compiled once.
+    """
+    return _process_many(items, operator.attrgetter('encrypt'))
+
+def decrypt_many(items):
+    """
+    Decrypt many (ciphertext, key) pairs; each distinct key is compiled once.
+    """
+    return _process_many(items, operator.attrgetter('decrypt'))
+
+def normalize_stream(chunks):
+    """
+    Upper-case each text chunk, fold the Romanian letter variants and drop everything that has no
+    cell in the matrix. Yields the letters chunk by chunk.
+    """
+    for chunk in chunks:
+        letters = normalize_text(chunk)
+        if letters:
+            yield letters
+
+def split_pairs(letters):
+    """Split an even-length string into its digraphs without building an intermediate list."""
+    return map(operator.add, letters[0::2], letters[1::2])
+
+def encrypt_stream(chunks, key):
+    """
+    Encrypt an iterable of plaintext chunks lazily, yielding ciphertext chunks.
+    An odd letter at the end of a chunk is carried over to the next one. The message is always
+    padded (ODD_PADDING or EVEN_PADDING), so decrypt_stream can remove the padding exactly.
+    """
+    playfair = get_playfair_key(key)
+    carry = ''
+    for letters in normalize_stream(chunks):
+        letters = carry + letters
+        even = len(letters) - len(letters) % 2
+        carry = letters[even:]
+        yield playfair.encrypt_pairs(split_pairs(letters[:even]))
+    yield playfair.encrypt_pairs(split_pairs(pad_letters(carry)))
+
+def decrypt_stream(chunks, key):
+    """
+    Decrypt an iterable of ciphertext chunks produced by encrypt_stream, yielding plaintext chunks.
+    The last two letters are held back until the end, where the padding is removed.
+    """
+    playfair = get_playfair_key(key)
+    carry = ''
+    held = ''
+    for letters in normalize_stream(chunks):
+        letters = carry + letters
+        even = len(letters) - len(letters) % 2
+        carry = letters[even:]
+        plaintext = held + playfair.decrypt_pairs(split_pairs(letters[:even]))
+        held = plaintext[-2:]
+        if plaintext[:-2]:
+            yield plaintext[:-2]
+    if carry:
+        raise ValueError("Ciphertext has an odd number of letters.")
+    held = remove_padding(held)
+    if held:
+        yield held
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    """Read a UTF-8 text file chunk by chunk."""
+    with open(path, 'r', encoding='utf-8') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def encrypt_file(input_path, output_path, key, chunk_size=CHUNK_SIZE):
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.writelines(encrypt_stream(read_chunks(input_path, chunk_size), key))
+
+def decrypt_file(input_path, output_path, key, chunk_size=CHUNK_SIZE):
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.writelines(decrypt_stream(read_chunks(input_path, chunk_size), key))
 
 if __name__ == "__main__":
     print("Welcome to the Playfair Cipher!")
@@ -79,18 +248,20 @@ if __name__ == "__main__":
         print("Choose an operation:")
         print("1. Encrypt")
         print("2. Decrypt")
-        print("3. Exit")
+        print("3. Encrypt file")
+        print("4. Decrypt file")
+        print("5. Exit")
 
         try:
-            operation = int(input("Enter the number (1-3): "))
+            operation = int(input("Enter the number (1-5): "))
         except ValueError:
             print("Invalid input. Please try again.")
             continue
 
-        if operation == 3:
+        if operation == 5:
             print("Exiting...")
             break
-        elif operation in [1, 2]:
+        elif operation in [1, 2, 3, 4]:
             key = input("Enter the key: ")
             if len(key) < 7:
                 print("Key must be at least 7 characters long. Please try again.")
@@ -100,9 +271,19 @@ if __name__ == "__main__":
                 plaintext = input("Enter the plaintext: ")
                 ciphertext = encrypt_message(plaintext, key)
                 print("Ciphertext:", ciphertext)
+            elif operation in [3, 4]:
+                input_path = input("Enter the input file path: ")
+                output_path = input("Enter the output file path: ")
+                if operation == 3:
+                    encrypt_file(input_path, output_path, key)
+                else:
+                    decrypt_file(input_path, output_path, key)
+                print("Result written to", output_path)
             else:
                 ciphertext = input("Enter the ciphertext: ")
-                plaintext = decrypt_message(ciphertext, key)
-                print("Plaintext:", plaintext)
+                try:
+                    print("Plaintext:", decrypt_message(ciphertext, key))
+                except ValueError as e:
+                    print("Invalid ciphertext:", e)
         else:
             print("Invalid operation. Please try again.")
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""
+DES bitsliced cu NumPy: procesează simultan multe blocuri (sau multe chei).
+
+Bitul j al tuturor blocurilor este ținut într-un „plan” de cuvinte uint64, fiecare bit al unui
+cuvânt aparținând altui bloc. Astfel, permutările (IP, E, P, FP) devin simple reordonări de
+planuri, iar S-box-urile sunt evaluate ca circuite booleene (AND/OR/XOR/NOT) pe tablouri
+întregi, pentru 64 de blocuri per cuvânt. Rezultatele sunt identice cu cele din des.py.
+"""
+import numpy as np
+
+from des import E, FP, IP, P, sbox_value
+from main import key_schedule, key_to_int
+
+LANES = 64  # blocuri per cuvânt uint64
+BATCH_BLOCKS = 1 << 18  # blocuri transpuse deodată
+ALL_ONES = np.uint64((1 << 64) - 1)
+
+IP_INDEX = np.array(IP) - 1
+FP_INDEX = np.array(FP) - 1
+E_INDEX = np.array(E) - 1
+P_INDEX = np.array(P) - 1
+
+
+def build_subkey_sources():
+    """
+    Programarea cheilor este o simplă selecție de biți, deci bitul b al subcheii K_r provine
+    mereu din același bit al cheii. Returnează SUBKEY_SOURCE[r][b] = indexul bitului din cheie.
+    """
+    sources = np.zeros((16, 48), dtype=np.int64)
+    for key_bit in range(64):
+        for round_number, subkey in enumerate(key_schedule(1 << (63 - key_bit))):
+            for bit in range(48):
+                if subkey >> (47 - bit) & 1:
+                    sources[round_number, bit] = key_bit
+    return sources
+
+
+SUBKEY_SOURCE = build_subkey_sources()
+
+
+def compile_sbox(box):
+    """
+    Transformă S-box-ul într-un program boolean: descompunere Shannon după biții de intrare,
+    cu subfuncțiile identice (același tabel de adevăr) calculate o singură dată pentru toate
+    cele 4 ieșiri. Registrele 0-5 sunt intrările; întoarce (instrucțiuni, registrele de ieșire).
+    """
+    program = []
+    memo = {}
+
+    def build(table, variable):
+        if all(value == table[0] for value in table):
+            return table[0] == 1  # constantă: True/False
+        if table in memo:
+            return memo[table]
+        half = len(table) // 2
+        low, high = build(table[:half], variable + 1), build(table[half:], variable + 1)
+        register = 6 + len(program)
+        if low is False and high is True:
+            memo[table] = variable
+            return variable
+        if low is True and high is False:
+            program.append(('not', variable))
+        elif low is False:
+            program.append(('and', variable, high))
+        elif high is False:
+            program.append(('andnot', low, variable))
+        elif low is True:
+            program.append(('ornot', high, variable))
+        elif high is True:
+            program.append(('or', low, variable))
+        else:
+            program.append(('mux', variable, low, high))
+        memo[table] = register
+        return register
+
+    outputs = []
+    for output_bit in range(4):
+        table = tuple(sbox_value(box, value) >> (3 - output_bit) & 1 for value in range(64))
+        outputs.append(build(table, 0))
+    return program, outputs
+
+
+SBOX_PROGRAMS = [compile_sbox(box) for box in range(8)]
+
+
+def run_sbox(inputs, compiled):
+    """Evaluează programul unui S-box pe 6 planuri de intrare; întoarce cele 4 planuri de ieșire."""
+    program, outputs = compiled
+    registers = list(inputs)
+    for instruction in program:
+        op = instruction[0]
+        if op == 'mux':
+            _, s, low, high = instruction
+            a = registers[low]
+            registers.append(a ^ ((a ^ registers[high]) & registers[s]))
+        elif op == 'not':
+            registers.append(~registers[instruction[1]])
+        elif op == 'and':
+            registers.append(registers[instruction[1]] & registers[instruction[2]])
+        elif op == 'andnot':
+            registers.append(registers[instruction[1]] & ~registers[instruction[2]])
+        elif op == 'or':
+            registers.append(registers[instruction[1]] | registers[instruction[2]])
+        else:
+            registers.append(registers[instruction[1]] | ~registers[instruction[2]])
+    return [registers[register] for register in outputs]
+
+
+def to_planes(blocks):
+    """Blocuri uint64 (N) -> planuri (64, W), cu N completat până la un multiplu de 64."""
+    blocks = np.asarray(blocks, dtype=np.uint64)
+    words = -(-len(blocks) // LANES)
+    padded = np.zeros(words * LANES, dtype='>u8')
+    padded[:len(blocks)] = blocks
+    bits = np.unpackbits(padded.view(np.uint8).reshape(-1, 8), axis=1)  # (N, 64), bitul 1 primul
+    bits = bits.reshape(words, LANES, 64).transpose(2, 0, 1)
+    packed = np.ascontiguousarray(np.packbits(bits, axis=2, bitorder='little'))
+    return packed.view('<u8').reshape(64, words)
+
+
+def from_planes(planes, count):
+    """Inversul lui to_planes: planuri (64, W) -> primele `count` blocuri uint64."""
+    words = planes.shape[1]
+    lanes = np.ascontiguousarray(planes, dtype='<u8').view(np.uint8).reshape(64, words, 8)
+    bits = np.unpackbits(lanes, axis=2, bitorder='little').transpose(1, 2, 0).reshape(-1, 64)
+    packed = np.ascontiguousarray(np.packbits(bits, axis=1))
+    return packed.view('>u8').reshape(-1)[:count].astype(np.uint64)
+
+
+def key_planes(keys):
+    """
+    Planurile subcheilor, forma (16, 48, W). O singură cheie dă planuri constante (0 sau numai 1)
+    de lățime 1, care se extind automat peste toate cuvintele; o listă de chei dă o cheie pe bloc.
+    """
+    if np.ndim(keys) == 0:
+        key = key_to_int(keys)
+        bits = np.array([key >> (63 - bit) & 1 for bit in range(64)], dtype=np.uint64)
+        return (bits * ALL_ONES)[SUBKEY_SOURCE][:, :, None]
+    return to_planes(keys)[SUBKEY_SOURCE]
+
+
+def crypt_planes(planes, subkeys, decrypt=False):
+    """Cele 16 runde DES pe planuri: IP, Feistel cu S-box-uri booleene, FP."""
+    planes = planes[IP_INDEX]
+    left, right = planes[:32], planes[32:]
+    rounds = range(15, -1, -1) if decrypt else range(16)
+    for round_number in rounds:
+        expanded = right[E_INDEX] ^ subkeys[round_number]
+        sbox_out = []
+        for box in range(8):
+            sbox_out.extend(run_sbox(expanded[6 * box:6 * box + 6], SBOX_PROGRAMS[box]))
+        left, right = right, left ^ np.stack(sbox_out)[P_INDEX]
+    return np.concatenate([right, left])[FP_INDEX]
+
+
+def _crypt_blocks(blocks, key, decrypt):
+    blocks = np.asarray(blocks, dtype=np.uint64)
+    subkeys = key_planes(key)
+    output = np.empty(len(blocks), dtype=np.uint64)
+    # loturi de dimensiune fixă, ca memoria pentru transpunerea în planuri să rămână mărginită
+    for start in range(0, len(blocks), BATCH_BLOCKS):
+        batch = blocks[start:start + BATCH_BLOCKS]
+        output[start:start + len(batch)] = from_planes(crypt_planes(to_planes(batch), subkeys, decrypt), len(batch))
+    return output
+
+
+def encrypt_blocks(blocks, key):
+    """Criptează un tablou de blocuri de 64 de biți cu aceeași cheie."""
+    return _crypt_blocks(blocks, key, False)
+
+
+def decrypt_blocks(blocks, key):
+    """Decriptează un tablou de blocuri de 64 de biți cu aceeași cheie."""
+    return _crypt_blocks(blocks, key, True)
+
+
+def encrypt_under_keys(block, keys):
+    """Criptează același bloc sub fiecare cheie din `keys` (util la căutarea cheilor)."""
+    keys = np.asarray(keys, dtype=np.uint64)
+    planes = to_planes(np.full(len(keys), block, dtype=np.uint64))
+    return from_planes(crypt_planes(planes, key_planes(keys)), len(keys))
+
+
+def encrypt_ecb(data, key):
+    """ECB pe bytes (lungime multiplu de 8), echivalent cu des.encrypt_ecb pentru DES simplu."""
+    blocks = np.frombuffer(data, dtype='>u8').astype(np.uint64)
+    return encrypt_blocks(blocks, key).astype('>u8').tobytes()
+
+
+def decrypt_ecb(data, key):
+    blocks = np.frombuffer(data, dtype='>u8').astype(np.uint64)
+    return decrypt_blocks(blocks, key).astype('>u8').tobytes()
@@ -0,0 +1,298 @@
+"""
+Implementarea completă DES și 3DES-EDE, construită peste programarea cheilor din main.py
+(PC-1, PC-2, SHIFT_SCHEDULE).
+
+Permutările IP și FP se aplică prin tabele de căutare pe octeți, iar expansiunea E, S-box-urile
+și permutarea P sunt combinate în 8 tabele SP precalculate, astfel încât o rundă Feistel
+înseamnă 8 căutări. Modurile ECB, CBC și CTR lucrează pe bytes/memoryview; CTR împarte
+bufferele mari între mai multe procese.
+"""
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from main import build_byte_tables, key_schedule, key_to_int, permute
+
+# Permutarea inițială IP
+IP = [
+    58, 50, 42, 34, 26, 18, 10, 2,
+    60, 52, 44, 36, 28, 20, 12, 4,
+    62, 54, 46, 38, 30, 22, 14, 6,
+    64, 56, 48, 40, 32, 24, 16, 8,
+    57, 49, 41, 33, 25, 17, 9, 1,
+    59, 51, 43, 35, 27, 19, 11, 3,
+    61, 53, 45, 37, 29, 21, 13, 5,
+    63, 55, 47, 39, 31, 23, 15, 7
+]
+
+# Permutarea finală FP = IP^-1
+FP = [
+    40, 8, 48, 16, 56, 24, 64, 32,
+    39, 7, 47, 15, 55, 23, 63, 31,
+    38, 6, 46, 14, 54, 22, 62, 30,
+    37, 5, 45, 13, 53, 21, 61, 29,
+    36, 4, 44, 12, 52, 20, 60, 28,
+    35, 3, 43, 11, 51, 19, 59, 27,
+    34, 2, 42, 10, 50, 18, 58, 26,
+    33, 1, 41, 9, 49, 17, 57, 25
+]
+
+# Tabelul de expansiune E (32 -> 48 de biți)
+E = [
+    32, 1, 2, 3, 4, 5,
+    4, 5, 6, 7, 8, 9,
+    8, 9, 10, 11, 12, 13,
+    12, 13, 14, 15, 16, 17,
+    16, 17, 18, 19, 20, 21,
+    20, 21, 22, 23, 24, 25,
+    24, 25, 26, 27, 28, 29,
+    28, 29, 30, 31, 32, 1
+]
+
+# Permutarea P aplicată ieșirii S-box-urilor
+P = [
+    16, 7, 20, 21, 29, 12, 28, 17,
+    1, 15, 23, 26, 5, 18, 31, 10,
+    2, 8, 24, 14, 32, 27, 3, 9,
+    19, 13, 30, 6, 22, 11, 4, 25
+]
+
+# Cele 8 S-box-uri, fiecare cu 4 rânduri a câte 16 valori
+S_BOXES = [
+    [14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7,
+     0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8,
+     4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0,
+     15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13],
+    [15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10,
+     3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5,
+     0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15,
+     13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9],
+    [10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8,
+     13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1,
+     13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7,
+     1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12],
+    [7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15,
+     13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9,
+     10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4,
+     3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14],
+    [2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9,
+     14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6,
+     4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14,
+     11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3],
+    [12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11,
+     10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8,
+     9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6,
+     4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13],
+    [4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1,
+     13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6,
+     1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2,
+     6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12],
+    [13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7,
+     1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2,
+     7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8,
+     2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11]
+]
+
+BLOCK_SIZE = 8
+MASK32 = 0xFFFFFFFF
+MASK64 = (1 << 64) - 1
+PARALLEL_THRESHOLD = 1 << 20  # bufferele CTR mai mari de atât sunt împărțite între procese
+
+IP_TABLES = build_byte_tables(IP, 64)
+FP_TABLES = build_byte_tables(FP, 64)
+P_TABLES = build_byte_tables(P, 32)
+
+
+def sbox_value(box, six_bits):
+    """Valoarea S-box-ului: biții 1 și 6 aleg rândul, biții 2-5 coloana."""
+    row = ((six_bits >> 4) & 0b10) | (six_bits & 1)
+    column = (six_bits >> 1) & 0xF
+    return S_BOXES[box][row * 16 + column]
+
+
+def build_sp_tables():
+    """
+    Combină S-box-ul i cu permutarea P: SP[i][v] este contribuția pe 32 de biți a intrării v de
+    6 biți a S-box-ului i, deja permutată cu P. Funcția f devine un XOR de 8 căutări.
+    """
+    return [[permute(sbox_value(box, value) << (28 - 4 * box), P_TABLES, 32) for value in range(64)]
+            for box in range(8)]
+
+
+SP_TABLES = build_sp_tables()
+
+
+def feistel(right, round_key):
+    """Funcția f(R, K): expansiunea E, XOR cu subcheia, S-box-uri și P prin tabelele SP."""
+    # E ia grupuri de 6 biți consecutivi (circular) din R: îl extindem la 34 de biți R32 R1..R32 R1
+    extended = ((right & 1) << 33) | (right << 1) | (right >> 31)
+    sp1, sp2, sp3, sp4, sp5, sp6, sp7, sp8 = SP_TABLES
+    k1, k2, k3, k4, k5, k6, k7, k8 = round_key
+    return (sp1[((extended >> 28) & 0x3F) ^ k1] | sp2[((extended >> 24) & 0x3F) ^ k2]
+            | sp3[((extended >> 20) & 0x3F) ^ k3] | sp4[((extended >> 16) & 0x3F) ^ k4]
+            | sp5[((extended >> 12) & 0x3F) ^ k5] | sp6[((extended >> 8) & 0x3F) ^ k6]
+            | sp7[((extended >> 4) & 0x3F) ^ k7] | sp8[(extended & 0x3F) ^ k8])
+
+
+@lru_cache(maxsize=1024)
+def round_keys(key):
+    """Subcheile cheii împărțite în grupuri de 6 biți, în ordinea de criptare."""
+    return tuple(tuple((subkey >> (42 - 6 * i)) & 0x3F for i in range(8)) for subkey in key_schedule(key))
+
+
+def crypt_block(block, keys):
+    """Aplică IP, cele 16 runde Feistel cu subcheile date și FP pe un bloc de 64 de biți."""
+    block = permute(block, IP_TABLES, 64)
+    left, right = block >> 32, block & MASK32
+    for round_key in keys:
+        left, right = right, left ^ feistel(right, round_key)
+    return permute((right << 32) | left, FP_TABLES, 64)
+
+
+def crypt_block_subkeys(block, subkeys):
+    """
+    Ca crypt_block, dar cu subcheile ca întregi de 48 de biți (rezultatul lui key_schedule).
+    Util când subcheile sunt actualizate incremental, fără a le reîmpărți în grupuri de 6 biți.
+    """
+    sp1, sp2, sp3, sp4, sp5, sp6, sp7, sp8 = SP_TABLES
+    block = permute(block, IP_TABLES, 64)
+    left, right = block >> 32, block & MASK32
+    for k in subkeys:
+        extended = ((right & 1) << 33) | (right << 1) | (right >> 31)
+        left, right = right, left ^ (
+            sp1[((extended >> 28) ^ (k >> 42)) & 0x3F] | sp2[((extended >> 24) ^ (k >> 36)) & 0x3F]
+            | sp3[((extended >> 20) ^ (k >> 30)) & 0x3F] | sp4[((extended >> 16) ^ (k >> 24)) & 0x3F]
+            | sp5[((extended >> 12) ^ (k >> 18)) & 0x3F] | sp6[((extended >> 8) ^ (k >> 12)) & 0x3F]
+            | sp7[((extended >> 4) ^ (k >> 6)) & 0x3F] | sp8[(extended ^ k) & 0x3F])
+    return permute((right << 32) | left, FP_TABLES, 64)
+
+
+class DES:
+    """DES cu o cheie de 64 de biți (întreg, 8 octeți sau șir de biți)."""
+
+    def __init__(self, key):
+        self.key = key_to_int(key)
+        self.encrypt_keys = round_keys(self.key)
+        self.decrypt_keys = self.encrypt_keys[::-1]
+
+    def encrypt_block(self, block):
+        return crypt_block(block, self.encrypt_keys)
+
+    def decrypt_block(self, block):
+        return crypt_block(block, self.decrypt_keys)
+
+    def key_material(self):
+        return self.key.to_bytes(8, 'big')
+
+
+class TripleDES:
+    """3DES-EDE: C = E_K3(D_K2(E_K1(P))). Cheia are 16 octeți (K3 = K1) sau 24 de octeți."""
+
+    def __init__(self, key):
+        key = bytes(key)
+        if len(key) not in (16, 24):
+            raise ValueError("Cheia 3DES trebuie să aibă 16 sau 24 de octeți.")
+        if len(key) == 16:
+            key += key[:8]
+        self.key = key
+        self.stages = [DES(key[i:i + 8]) for i in range(0, 24, 8)]
+
+    def encrypt_block(self, block):
+        first, second, third = self.stages
+        return third.encrypt_block(second.decrypt_block(first.encrypt_block(block)))
+
+    def decrypt_block(self, block):
+        first, second, third = self.stages
+        return first.decrypt_block(second.encrypt_block(third.decrypt_block(block)))
+
+    def key_material(self):
+        return self.key
+
+
+def new_cipher(key):
+    """DES pentru chei de 8 octeți, 3DES-EDE pentru chei de 16 sau 24 de octeți."""
+    if isinstance(key, (int, str)) or len(key) == 8:
+        return DES(key)
+    return TripleDES(key)
+
+
+def pad(data):
+    """Completare PKCS#7 până la un multiplu de 8 octeți."""
+    length = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return bytes(data) + bytes([length]) * length
+
+
+def unpad(data):
+    """Elimină completarea PKCS#7."""
+    length = data[-1] if data else 0
+    if not 1 <= length <= BLOCK_SIZE or bytes(data[-length:]) != bytes([length]) * length:
+        raise ValueError("Completare PKCS#7 invalidă.")
+    return bytes(data[:-length])
+
+
+def _blocks(data):
+    """Interpretează bufferul ca blocuri de 64 de biți big-endian."""
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Lungimea datelor trebuie să fie multiplu de 8 octeți (folosiți pad()).")
+    return struct.unpack(f">{len(data) // BLOCK_SIZE}Q", data)
+
+
+def _pack(blocks):
+    return struct.pack(f">{len(blocks)}Q", *blocks)
+
+
+def encrypt_ecb(cipher, data):
+    return _pack([cipher.encrypt_block(block) for block in _blocks(data)])
+
+
+def decrypt_ecb(cipher, data):
+    return _pack([cipher.decrypt_block(block) for block in _blocks(data)])
+
+
+def encrypt_cbc(cipher, data, iv):
+    previous = int.from_bytes(iv, 'big')
+    output = []
+    for block in _blocks(data):
+        previous = cipher.encrypt_block(block ^ previous)
+        output.append(previous)
+    return _pack(output)
+
+
+def decrypt_cbc(cipher, data, iv):
+    previous = int.from_bytes(iv, 'big')
+    output = []
+    for block in _blocks(data):
+        output.append(cipher.decrypt_block(block) ^ previous)
+        previous = block
+    return _pack(output)
+
+
+def _ctr_segment(cipher, data, counter):
+    """XOR-ează data cu fluxul de chei pornind de la valoarea contorului dată."""
+    whole, rest = divmod(len(data), BLOCK_SIZE)
+    stream = _pack([cipher.encrypt_block((counter + i) & MASK64) for i in range(whole + (1 if rest else 0))])
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(stream[:len(data)], 'big')).to_bytes(len(data), 'big')
+
+
+def _ctr_worker(key, data, counter):
+    return _ctr_segment(new_cipher(key), data, counter)
+
+
+def crypt_ctr(cipher, data, nonce, workers=None):
+    """
+    Criptare și decriptare în modul CTR (aceeași operație). `nonce` (8 octeți) este valoarea
+    inițială a contorului de 64 de biți. Bufferele peste PARALLEL_THRESHOLD sunt împărțite la
+    granița de bloc între mai multe procese, fiecare pornind de la contorul segmentului său.
+    """
+    counter = int.from_bytes(nonce, 'big')
+    data = memoryview(data).cast('B')
+    if len(data) <= PARALLEL_THRESHOLD or (workers or os.cpu_count() or 1) == 1:
+        return _ctr_segment(cipher, data, counter)
+    segment = PARALLEL_THRESHOLD // 4 // BLOCK_SIZE * BLOCK_SIZE
+    starts = range(0, len(data), segment)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_ctr_worker, [cipher.key_material()] * len(starts),
+                         [bytes(data[start:start + segment]) for start in starts],
+                         [counter + start // BLOCK_SIZE for start in starts])
+        return b''.join(parts)
@@ -0,0 +1,173 @@
+"""
+Căutarea cheii DES cu text clar cunoscut, într-un spațiu de chei redus: o cheie de bază cu
+N biți necunoscuți (implicit cei mai puțin semnificativi N biți efectivi, fără biții de paritate).
+
+Cheile sunt parcurse în ordinea codului Gray, astfel încât două chei consecutive diferă printr-un
+singur bit. Programarea cheilor este o selecție de biți, deci inversarea bitului b al cheii
+inversează mereu aceiași biți din subchei: subcheile se actualizează cu 16 XOR-uri, fără a
+recalcula key_schedule. Spațiul este împărțit în segmente distribuite pe un pool de procese;
+segmentele terminate sunt salvate într-un fișier de checkpoint pentru reluare.
+
+Exemplu:
+    python keysearch.py --plaintext 0123456789ABCDEF --ciphertext 85E813540F0AB405 \\
+        --base 133457799BBCDF00 --bits 20 --checkpoint search.json
+"""
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Manager
+
+from des import crypt_block_subkeys
+from main import key_schedule
+
+# Biții de paritate sunt bitul cel mai puțin semnificativ al fiecărui octet; nu intră în subchei
+EFFECTIVE_BITS = [bit for bit in range(64) if bit % 8]
+# Efectul inversării fiecărui bit al cheii asupra celor 16 subchei
+SUBKEY_DELTAS = [key_schedule(1 << bit) for bit in range(64)]
+STOP_CHECK_INTERVAL = 4096  # cât de des verifică un proces dacă altul a găsit deja cheia
+
+
+def unknown_positions(bits):
+    """Pozițiile (în întregul de 64 de biți) ale celor `bits` biți necunoscuți."""
+    if not 0 < bits <= len(EFFECTIVE_BITS):
+        raise ValueError("Numărul de biți necunoscuți trebuie să fie între 1 și 56.")
+    return EFFECTIVE_BITS[:bits]
+
+
+def key_at(base, positions, index):
+    """Cheia cu numărul de ordine `index` în parcurgerea Gray a spațiului."""
+    gray = index ^ (index >> 1)
+    key = base
+    for j, position in enumerate(positions):
+        key &= ~(1 << position)
+        if gray >> j & 1:
+            key |= 1 << position
+    return key
+
+
+def search_segment(base, positions, start, end, plaintext, ciphertext, stop):
+    """
+    Caută în cheile cu indecși [start, end). Întoarce (cheia găsită sau None, chei încercate,
+    secunde, pid).
+    """
+    started = time.perf_counter()
+    key = key_at(base, positions, start)
+    subkeys = list(key_schedule(key))
+    deltas = [SUBKEY_DELTAS[position] for position in positions]
+    tried = 0
+    for index in range(start, end):
+        if index != start:
+            # între indecșii Gray i-1 și i se schimbă bitul dat de numărul de zerouri finale ale lui i
+            flipped = (index & -index).bit_length() - 1
+            key ^= 1 << positions[flipped]
+            delta = deltas[flipped]
+            for r in range(16):
+                subkeys[r] ^= delta[r]
+        tried += 1
+        if crypt_block_subkeys(plaintext, subkeys) == ciphertext:
+            stop.set()
+            return key, tried, time.perf_counter() - started, os.getpid()
+        if tried % STOP_CHECK_INTERVAL == 0 and stop.is_set():
+            break
+    return None, tried, time.perf_counter() - started, os.getpid()
+
+
+def load_checkpoint(path, params):
+    """
+    Segmentele deja terminate, cheia (dacă a fost găsită) și numărul de segmente pentru aceeași
+    căutare: `params` (text clar, text cifrat, cheia de bază, biții necunoscuți) trebuie să coincidă.
+    """
+    if not path or not os.path.exists(path):
+        return set(), None, None
+    with open(path, 'r') as file:
+        data = json.load(file)
+    if any(data.get(name) != value for name, value in params.items()):
+        raise ValueError("Checkpoint-ul aparține altei căutări.")
+    return set(data['done']), data.get('found'), data['segments']
+
+
+def save_checkpoint(path, params, segments, done, found):
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w') as file:
+        json.dump({**params, 'segments': segments, 'done': sorted(done), 'found': found}, file)
+    os.replace(temporary, path)
+
+
+def search(plaintext, ciphertext, base, bits, workers=None, segments=None, checkpoint=None):
+    """
+    Caută cheia care duce `plaintext` în `ciphertext` (blocuri de 64 de biți, ca întregi).
+    Întoarce (cheia sau None, statistici pe proces {pid: (chei, secunde)}, total chei, secunde).
+    """
+    positions = unknown_positions(bits)
+    workers = workers or os.cpu_count() or 1
+    total = 1 << bits
+    params = {'plaintext': plaintext, 'ciphertext': ciphertext, 'base': base, 'bits': bits,
+              'positions': positions}
+    done, found, saved_segments = load_checkpoint(checkpoint, params)
+    if saved_segments is None:
+        segments = min(segments or workers * 16, total)
+    elif segments is None or min(segments, total) == saved_segments:
+        # numerele segmentelor din checkpoint au sens doar cu aceeași împărțire a spațiului
+        segments = saved_segments
+    else:
+        raise ValueError(f"Checkpoint-ul a fost salvat cu {saved_segments} segmente.")
+    size = -(-total // segments)
+    per_worker = defaultdict(lambda: [0, 0.0])
+    tried_total = 0
+    started = time.perf_counter()
+    if found is None:
+        with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+            stop = manager.Event()
+            futures = {pool.submit(search_segment, base, positions, index * size,
+                                   min(total, (index + 1) * size), plaintext, ciphertext, stop): index
+                       for index in range(segments) if index not in done}
+            for future in as_completed(futures):
+                key, tried, seconds, pid = future.result()
+                per_worker[pid][0] += tried
+                per_worker[pid][1] += seconds
+                tried_total += tried
+                if key is not None:
+                    found = key
+                elif not stop.is_set():
+                    done.add(futures[future])
+                if checkpoint:
+                    save_checkpoint(checkpoint, params, segments, done, found)
+                if found is not None:
+                    # segmentele încă nepornite sunt anulate; cele în curs văd `stop` și se opresc
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    return found, dict(per_worker), tried_total, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Căutare DES cu text clar cunoscut pe un spațiu de chei redus.")
+    parser.add_argument('--plaintext', required=True, help="bloc de 64 de biți în hex")
+    parser.add_argument('--ciphertext', required=True, help="bloc de 64 de biți în hex")
+    parser.add_argument('--base', required=True, help="cheia de bază în hex; biții necunoscuți sunt ignorați")
+    parser.add_argument('--bits', type=int, required=True, help="numărul de biți necunoscuți (1-56)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--segments', type=int, default=None, help="în câte segmente se împarte spațiul")
+    parser.add_argument('--checkpoint', help="fișier JSON pentru salvare și reluare")
+    args = parser.parse_args()
+
+    try:
+        key, per_worker, tried, seconds = search(int(args.plaintext, 16), int(args.ciphertext, 16),
+                                                 int(args.base, 16), args.bits, args.workers,
+                                                 args.segments, args.checkpoint)
+    except ValueError as e:
+        parser.error(str(e))
+    for pid, (count, busy) in sorted(per_worker.items()):
+        print(f"Procesul {pid}: {count} chei, {count / busy if busy else 0:.0f} chei/s")
+    print(f"Total: {tried} chei în {seconds:.2f} s, {tried / seconds if seconds else 0:.0f} chei/s")
+    if key is None:
+        print("Cheia nu a fost găsită.")
+    else:
+        print(f"Cheia găsită: {key:016X}")
+
+
+if __name__ == "__main__":
+    main()
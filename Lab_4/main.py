@@ -1,4 +1,5 @@
 import random
+from functools import lru_cache
 
 # Tabelul PC-1 pentru permutarea cheii inițiale K+
 PC1 = [
@@ -12,12 +13,60 @@ PC1 = [
     21, 13, 5, 28, 20, 12, 4
 ]
 
+# Tabelul PC-2 pentru selectarea subcheii K_i de 48 de biți din C_i D_i
+PC2 = [
+    14, 17, 11, 24, 1, 5,
+    3, 28, 15, 6, 21, 10,
+    23, 19, 12, 4, 26, 8,
+    16, 7, 27, 20, 13, 2,
+    41, 52, 31, 37, 47, 55,
+    30, 40, 51, 45, 33, 48,
+    44, 49, 39, 56, 34, 53,
+    46, 42, 50, 36, 29, 32
+]
+
 # Numărul de shiftări pentru fiecare rundă
 SHIFT_SCHEDULE = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
 
+MASK28 = (1 << 28) - 1
+KEY_CACHE_SIZE = 4096  # numărul de chei pentru care subcheile rămân în cache
+
+def build_byte_tables(table, input_bits):
+    """
+    Precalculează o permutare de biți ca tabele de căutare pe octeți: pentru fiecare octet al
+    intrării și fiecare din cele 256 de valori, biții de ieșire pe care îi produce.
+    Biții sunt numerotați de la 1, începând cu cel mai semnificativ, ca în standardul DES.
+    """
+    output_bits = len(table)
+    tables = []
+    for byte in range(input_bits // 8):
+        # contribuția fiecărui bit al octetului (bitul 0 = cel mai puțin semnificativ)
+        contributions = [0] * 8
+        for position, source in enumerate(table):
+            if (source - 1) // 8 == byte:
+                contributions[7 - (source - 1) % 8] |= 1 << (output_bits - 1 - position)
+        entries = [0] * 256
+        for value in range(1, 256):
+            lowest = value & -value
+            entries[value] = entries[value ^ lowest] | contributions[lowest.bit_length() - 1]
+        tables.append(entries)
+    return tables
+
+def permute(value, tables, input_bits):
+    """Aplică o permutare precalculată cu build_byte_tables pe un întreg de input_bits biți."""
+    result = 0
+    shift = input_bits - 8
+    for entries in tables:
+        result |= entries[(value >> shift) & 0xFF]
+        shift -= 8
+    return result
+
+PC1_TABLES = build_byte_tables(PC1, 64)
+PC2_TABLES = build_byte_tables(PC2, 56)
+
 def generate_random_key():
     """Generează o cheie aleatorie de 64 de biți."""
-    return ''.join(random.choice('01') for _ in range(64))
+    return format(random.getrandbits(64), '064b')
 
 def apply_permutation(table, key):
     """Aplică o permutare specifică pe un șir de biți."""
@@ -27,25 +76,66 @@ def left_shift(bits, shifts):
     """Realizează o deplasare circulară la stânga pe un șir de biți."""
     return bits[shifts:] + bits[:shifts]
 
-def des_key_schedule(key_plus, i):
-    """Calculează C_i și D_i pentru o rundă i dată."""
-    # Pasul 1: Permutarea PC-1
-    permuted_key = apply_permutation(PC1, key_plus)
-    print(f"Cheia după permutarea PC-1: {permuted_key}")
+def rotate28(value, shifts):
+    """Deplasare circulară la stânga pe o jumătate de cheie de 28 de biți."""
+    return ((value << shifts) | (value >> (28 - shifts))) & MASK28
+
+def key_to_int(key):
+    """Acceptă cheia ca întreg de 64 de biți, ca 8 octeți sau ca șir de 64 de caractere '0'/'1'."""
+    if isinstance(key, int):
+        return key
+    if isinstance(key, str):
+        return int(key, 2)
+    return int.from_bytes(key, 'big')
+
+def key_schedule(key, trace=False):
+    """
+    Calculează toate cele 16 subchei K_1..K_16 de 48 de biți, ca întregi.
+    Cu trace=True afișează pașii intermediari (C_i, D_i, K_i); altfel rezultatul vine din cache.
+    """
+    key = key_to_int(key)
+    if not trace:
+        return _cached_key_schedule(key)
+    return _key_schedule(key, trace)
 
-    # Împărțirea în C și D
-    c, d = permuted_key[:28], permuted_key[28:]
-    print(f"Cheia C0: {c}")
-    print(f"Cheia D0: {d}")
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _cached_key_schedule(key):
+    return _key_schedule(key, False)
+
+def _key_schedule(key, trace):
+    permuted_key = permute(key, PC1_TABLES, 64)
+    c, d = permuted_key >> 28, permuted_key & MASK28
+    if trace:
+        print(f"Cheia după permutarea PC-1: {permuted_key:056b}")
+        print(f"Cheia C0: {c:028b}")
+        print(f"Cheia D0: {d:028b}")
+    subkeys = []
+    for round_number, shifts in enumerate(SHIFT_SCHEDULE, start=1):
+        c, d = rotate28(c, shifts), rotate28(d, shifts)
+        subkeys.append(permute((c << 28) | d, PC2_TABLES, 56))
+        if trace:
+            print(f"Runda {round_number}: C{round_number} = {c:028b}, D{round_number} = {d:028b}, "
+                  f"K{round_number} = {subkeys[-1]:048b}")
+    return tuple(subkeys)
+
+def des_key_schedule(key_plus, i, trace=False):
+    """Calculează C_i și D_i pentru o rundă i dată."""
+    # Permutarea PC-1 și împărțirea în C și D
+    permuted_key = permute(key_to_int(key_plus), PC1_TABLES, 64)
+    c, d = permuted_key >> 28, permuted_key & MASK28
+    if trace:
+        print(f"Cheia după permutarea PC-1: {permuted_key:056b}")
+        print(f"Cheia C0: {c:028b}")
+        print(f"Cheia D0: {d:028b}")
 
     # Aplicarea shiftărilor până la runda i
     for round_number in range(1, i + 1):
         shifts = SHIFT_SCHEDULE[round_number - 1]
-        c = left_shift(c, shifts)
-        d = left_shift(d, shifts)
-        print(f"Runda {round_number}: C{round_number} = {c}, D{round_number} = {d}")
+        c, d = rotate28(c, shifts), rotate28(d, shifts)
+        if trace:
+            print(f"Runda {round_number}: C{round_number} = {c:028b}, D{round_number} = {d:028b}")
 
-    return c, d
+    return f"{c:028b}", f"{d:028b}"
 
 def main():
     print("Algoritmul DES: Calcularea C_i și D_i pentru un i dat.")
@@ -69,8 +159,9 @@ def main():
         return
 
     # Calcularea cheilor C_i și D_i
-    c_i, d_i = des_key_schedule(key_plus, i)
+    c_i, d_i = des_key_schedule(key_plus, i, trace=True)
     print(f"Rezultatul final pentru runda {i}: C{i} = {c_i}, D{i} = {d_i}")
+    print(f"Subcheia K{i} = {key_schedule(key_plus)[i - 1]:048b}")
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,14 @@
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.x509 import (
-    NameOID, CertificateBuilder, BasicConstraints, Name, random_serial_number, NameAttribute, load_pem_x509_certificate
+    NameOID, CertificateBuilder, BasicConstraints, Name, random_serial_number, NameAttribute, load_pem_x509_certificate,
+    CertificateRevocationListBuilder, RevokedCertificateBuilder, load_pem_x509_crl
 )
-from utils import sign_file, verify_signature
+from utils import CRL_PATH, check_username, sign_file, verify_signature, write_atomic
 
 # Paths to store the PKI files
 BASE_DIR = "pki"
@@ -13,6 +16,7 @@ CA_DIR = os.path.join(BASE_DIR, "ca")
 USERS_DIR = os.path.join(BASE_DIR, "users")
 os.makedirs(CA_DIR, exist_ok=True)
 os.makedirs(USERS_DIR, exist_ok=True)
+KEY_TYPES = ("rsa", "ed25519", "ecdsa")
 
 
 def generate_ca():
@@ -21,14 +25,7 @@ def generate_ca():
 
     print("Generating CA private key...")
     ca_private_key = rsa.generate_private_key(public_exponent=65537, key_size=4096)
-    with open(ca_key_path, "wb") as f:
-        f.write(
-            ca_private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),
-            )
-        )
+    write_atomic(ca_key_path, private_key_bytes(ca_private_key))
 
     print("Generating CA self-signed certificate...")
     subject = issuer = Name([
@@ -50,62 +47,161 @@ def generate_ca():
         .add_extension(BasicConstraints(ca=True, path_length=None), critical=True)
         .sign(private_key=ca_private_key, algorithm=hashes.SHA256())
     )
-    with open(ca_cert_path, "wb") as f:
-        f.write(ca_cert.public_bytes(serialization.Encoding.PEM))
+    write_atomic(ca_cert_path, ca_cert.public_bytes(serialization.Encoding.PEM))
 
     print(f"CA setup complete: {ca_key_path}, {ca_cert_path}")
 
 
-def generate_user_certificate(username):
-    user_key_path = os.path.join(USERS_DIR, f"{username}.key")
-    user_cert_path = os.path.join(USERS_DIR, f"{username}.crt")
-
+def load_ca():
     with open(os.path.join(CA_DIR, "rootCA.key"), "rb") as f:
         ca_private_key = serialization.load_pem_private_key(f.read(), password=None)
     with open(os.path.join(CA_DIR, "rootCA.pem"), "rb") as f:
         ca_cert = load_pem_x509_certificate(f.read())
+    return ca_private_key, ca_cert
 
-    print(f"Generating private key for user: {username}...")
-    user_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-    with open(user_key_path, "wb") as f:
-        f.write(
-            user_private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),
-            )
-        )
 
-    print(f"Generating certificate for user: {username}...")
+def generate_user_key(key_type="rsa"):
+    if key_type == "rsa":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if key_type == "ed25519":
+        return ed25519.Ed25519PrivateKey.generate()
+    if key_type == "ecdsa":
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f"Unknown key type: {key_type}")
+
+
+def private_key_bytes(private_key):
+    # Ed25519 keys have no "traditional" OpenSSL encoding, only PKCS#8
+    key_format = (serialization.PrivateFormat.PKCS8 if isinstance(private_key, ed25519.Ed25519PrivateKey)
+                  else serialization.PrivateFormat.TraditionalOpenSSL)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=key_format,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def issue_user_certificate(username, public_key, ca_private_key, ca_cert):
     subject = Name([
         NameAttribute(NameOID.COUNTRY_NAME, "US"),
         NameAttribute(NameOID.ORGANIZATION_NAME, username),
         NameAttribute(NameOID.COMMON_NAME, f"{username} Certificate"),
     ])
-    user_cert = (
+    return (
         CertificateBuilder()
         .subject_name(subject)
         .issuer_name(ca_cert.subject)
-        .public_key(user_private_key.public_key())
+        .public_key(public_key)
         .serial_number(random_serial_number())
         .not_valid_before(datetime.now(timezone.utc))
         .not_valid_after(datetime.now(timezone.utc) + timedelta(days=365))
         .add_extension(BasicConstraints(ca=False, path_length=None), critical=True)
         .sign(private_key=ca_private_key, algorithm=hashes.SHA256())
     )
-    with open(user_cert_path, "wb") as f:
-        f.write(user_cert.public_bytes(serialization.Encoding.PEM))
+
+
+def generate_user_certificate(username, key_type="rsa", ca=None):
+    check_username(username)
+    user_key_path = os.path.join(USERS_DIR, f"{username}.key")
+    user_cert_path = os.path.join(USERS_DIR, f"{username}.crt")
+    ca_private_key, ca_cert = ca or load_ca()
+
+    print(f"Generating private key for user: {username}...")
+    user_private_key = generate_user_key(key_type)
+
+    print(f"Generating certificate for user: {username}...")
+    user_cert = issue_user_certificate(username, user_private_key.public_key(), ca_private_key, ca_cert)
+    write_atomic(user_key_path, private_key_bytes(user_private_key))
+    write_atomic(user_cert_path, user_cert.public_bytes(serialization.Encoding.PEM))
 
     print(f"User certificate generated: {user_key_path}, {user_cert_path}")
 
 
+# CA material of a provisioning worker process, loaded once by _init_provisioning
+_ca = None
+
+
+def _init_provisioning():
+    global _ca
+    _ca = load_ca()
+
+
+def _provision_user(username, key_type):
+    check_username(username)
+    user_private_key = generate_user_key(key_type)
+    user_cert = issue_user_certificate(username, user_private_key.public_key(), *_ca)
+    write_atomic(os.path.join(USERS_DIR, f"{username}.key"), private_key_bytes(user_private_key))
+    write_atomic(os.path.join(USERS_DIR, f"{username}.crt"), user_cert.public_bytes(serialization.Encoding.PEM))
+    return username
+
+
+def read_usernames(list_path):
+    """The distinct usernames of the list file; names that are not plain file names are reported and skipped."""
+    with open(list_path, "r", encoding="utf-8") as f:
+        names = dict.fromkeys(line.strip() for line in f if line.strip())
+    usernames = []
+    for name in names:
+        try:
+            usernames.append(check_username(name))
+        except ValueError as e:
+            print(f"Skipping {e}")
+    return usernames
+
+
+def provision_users(usernames, key_type="rsa", workers=None):
+    """Issue keys and certificates for many users; every worker loads the CA once."""
+    if key_type not in KEY_TYPES:
+        raise ValueError(f"Unknown key type: {key_type}")
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_provisioning) as pool:
+        futures = {pool.submit(_provision_user, username, key_type): username for username in usernames}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                done += 1
+            except Exception as e:
+                print(f"Provisioning failed for {futures[future]}: {e}")
+    print(f"Provisioned {done} of {len(futures)} users ({key_type}).")
+    return done
+
+
+def revoke_certificate(username):
+    """Add the user's certificate to the CA's revocation list (pki/ca/crl.pem)."""
+    with open(os.path.join(USERS_DIR, f"{username}.crt"), "rb") as f:
+        user_cert = load_pem_x509_certificate(f.read())
+    ca_private_key, ca_cert = load_ca()
+    now = datetime.now(timezone.utc)
+    builder = (
+        CertificateRevocationListBuilder()
+        .issuer_name(ca_cert.subject)
+        .last_update(now)
+        .next_update(now + timedelta(days=30))
+    )
+    revoked = set()
+    if os.path.exists(CRL_PATH):
+        with open(CRL_PATH, "rb") as f:
+            for entry in load_pem_x509_crl(f.read()):
+                builder = builder.add_revoked_certificate(entry)
+                revoked.add(entry.serial_number)
+    if user_cert.serial_number in revoked:
+        print(f"Certificate of {username} is already revoked.")
+        return
+    builder = builder.add_revoked_certificate(
+        RevokedCertificateBuilder().serial_number(user_cert.serial_number).revocation_date(now).build()
+    )
+    crl = builder.sign(private_key=ca_private_key, algorithm=hashes.SHA256())
+    write_atomic(CRL_PATH, crl.public_bytes(serialization.Encoding.PEM))
+    print(f"Certificate of {username} revoked: {CRL_PATH}")
+
+
 def print_menu():
     print("Choose an option:")
     print("1. Generate CA (Root Certificate Authority)")
     print("2. Generate User Certificate")
     print("3. Sign a File")
     print("4. Verify File Signature")
-    print("5. Exit")
+    print("5. Revoke a User Certificate")
+    print("6. Exit")
 
 
 def main():
@@ -118,7 +214,14 @@ def main():
             generate_ca()
         elif choice == "2":
             username = input("Enter the username for the certificate: ")
-            generate_user_certificate(username)
+            key_type = input(f"Enter the key type {KEY_TYPES} [rsa]: ").strip().lower() or "rsa"
+            while key_type not in KEY_TYPES:
+                print(f"Unknown key type: {key_type}")
+                key_type = input(f"Enter the key type {KEY_TYPES} [rsa]: ").strip().lower() or "rsa"
+            try:
+                generate_user_certificate(username, key_type)
+            except ValueError as e:
+                print(e)
         elif choice == "3":
             username = input("Enter the username for signing: ")
             file_path = input("Enter the file path to sign: ")
@@ -129,6 +232,9 @@ def main():
             signature_path = input("Enter the signature file path: ")
             verify_signature(username, file_path, signature_path)
         elif choice == "5":
+            username = input("Enter the username to revoke: ")
+            revoke_certificate(username)
+        elif choice == "6":
             print("Exiting the program.")
             break
         else:
@@ -136,4 +242,18 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="PKI lab: interactive menu, or bulk provisioning.")
+    commands = parser.add_subparsers(dest="command")
+    provision_parser = commands.add_parser("provision", help="issue keys and certificates for a list of users")
+    provision_parser.add_argument("users", help="file with one username per line")
+    provision_parser.add_argument("--key-type", choices=KEY_TYPES, default="rsa")
+    provision_parser.add_argument("--workers", type=int, default=None)
+    revoke_parser = commands.add_parser("revoke", help="revoke a user's certificate")
+    revoke_parser.add_argument("username")
+    args = parser.parse_args()
+    if args.command == "provision":
+        provision_users(read_usernames(args.users), args.key_type, args.workers)
+    elif args.command == "revoke":
+        revoke_certificate(args.username)
+    else:
+        main()
@@ -0,0 +1,246 @@
+"""
+Merkle-tree manifests for whole directories.
+
+Every file is a leaf, SHA-256("\\x00" + relative path + "\\x00" + file digest), in sorted path
+order; inner nodes are SHA-256("\\x01" + left + right), and an odd node at the end of a level is
+carried up unchanged. Only the root is signed, as SHA3-256("CS-merkle-manifest-v1\\x00" + root):
+file signatures cover the SHA-256 of the file, so none of them can pass for a manifest's. A local
+index of (size, mtime, inode, digest) per path lets a re-sign rehash just the files that changed,
+and a single file can be checked against the signed root with its inclusion proof alone.
+
+Example:
+    python manifest.py sign tudor release/
+    python manifest.py prove release/ docs/readme.txt --output readme.proof.json
+    python manifest.py verify-file readme.proof.json release/docs/readme.txt
+    python manifest.py verify release/
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.x509 import load_pem_x509_certificate
+
+from signer import KeyCache
+from utils import CertificateError, file_digest, sign_digest, validate_certificate, verify_digest, write_atomic
+
+USERS_DIR = os.path.join("pki", "users")
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+ROOT_DOMAIN = b"CS-merkle-manifest-v1\x00"
+
+
+def manifest_path_for(directory):
+    return f"{os.path.normpath(directory)}.manifest.json"
+
+
+def index_path_for(directory):
+    return f"{os.path.normpath(directory)}.index.json"
+
+
+def scan(directory):
+    """Yield (relative path, size, mtime_ns, inode) of every regular file, without following links."""
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    path = os.path.relpath(entry.path, directory).replace(os.sep, "/")
+                    yield path, stat.st_size, stat.st_mtime_ns, entry.inode()
+
+
+def load_index(index_path):
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, "r", encoding="utf-8") as f:
+        return {path: tuple(entry) for path, entry in json.load(f).items()}
+
+
+def hash_directory(directory, index=None, workers=None):
+    """
+    Return ({relative path: file digest}, new index). Files whose (size, mtime, inode) match
+    `index` keep their recorded digest; the others are rehashed on a thread pool.
+    """
+    index = index or {}
+    new_index, changed = {}, []
+    for path, size, mtime, inode in scan(directory):
+        entry = index.get(path)
+        if entry and entry[:3] == (size, mtime, inode):
+            new_index[path] = entry
+        else:
+            new_index[path] = (size, mtime, inode, None)
+            changed.append(path)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = pool.map(lambda path: file_digest(os.path.join(directory, path)).hex(), changed)
+        for path, digest in zip(changed, digests):
+            new_index[path] = new_index[path][:3] + (digest,)
+    return {path: new_index[path][3] for path in sorted(new_index)}, new_index
+
+
+def leaf_hash(path, digest):
+    return hashlib.sha256(LEAF_PREFIX + path.encode("utf-8") + b"\x00" + digest).digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def merkle_levels(leaves):
+    """All levels of the tree, from the leaves up to [root]."""
+    levels = [leaves or [hashlib.sha256(b"").digest()]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(files):
+    return merkle_levels([leaf_hash(path, bytes.fromhex(digest)) for path, digest in files.items()])[-1][0]
+
+
+def inclusion_proof(levels, position):
+    """Sibling hashes from the leaf at `position` up to the root, as [side, hex] pairs."""
+    proof = []
+    for level in levels[:-1]:
+        sibling = position ^ 1
+        if sibling < len(level):
+            proof.append(["left" if sibling < position else "right", level[sibling].hex()])
+        position //= 2
+    return proof
+
+
+def root_from_proof(leaf, proof):
+    node = leaf
+    for side, sibling in proof:
+        node = node_hash(bytes.fromhex(sibling), node) if side == "left" else node_hash(node, bytes.fromhex(sibling))
+    return node
+
+
+def signed_root_digest(root):
+    """
+    The 32 bytes signed for a root. Any SHA-256 value can be obtained by signing a file with the
+    right content, so the root is hashed with SHA3-256 after the domain prefix instead.
+    """
+    return hashlib.sha3_256(ROOT_DOMAIN + root).digest()
+
+
+def load_certificate(username, users_dir=USERS_DIR):
+    with open(os.path.join(users_dir, f"{username}.crt"), "rb") as f:
+        cert = load_pem_x509_certificate(f.read())
+    validate_certificate(cert)
+    return cert
+
+
+def sign_directory(username, directory, manifest_path=None, index_path=None, workers=None):
+    """Hash the directory (incrementally), sign the Merkle root and write the manifest."""
+    manifest_path = manifest_path or manifest_path_for(directory)
+    index_path = index_path or index_path_for(directory)
+    files, index = hash_directory(directory, load_index(index_path), workers)
+    root = merkle_root(files)
+    signature = sign_digest(KeyCache().get(username), signed_root_digest(root))
+    manifest = {"user": username, "root": root.hex(), "signature": signature.hex(), "files": files}
+    write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+    write_atomic(index_path, json.dumps(index).encode("utf-8"))
+    print(f"Signed {len(files)} files, root {root.hex()}: {manifest_path}")
+    return manifest
+
+
+def load_manifest(manifest_path):
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def verify_root(manifest):
+    """Raise unless the manifest's signature over its root is valid and made by a trusted certificate."""
+    cert = load_certificate(manifest["user"])
+    verify_digest(cert.public_key(), bytes.fromhex(manifest["signature"]),
+                  signed_root_digest(bytes.fromhex(manifest["root"])))
+
+
+def verify_directory(directory, manifest_path=None, workers=None):
+    """Rehash every file and check the tree against the signed manifest; returns the differing paths."""
+    manifest = load_manifest(manifest_path or manifest_path_for(directory))
+    verify_root(manifest)
+    files, _ = hash_directory(directory, workers=workers)
+    if merkle_root(manifest["files"]).hex() != manifest["root"]:
+        raise InvalidSignature("manifest file list does not match its root")
+    expected = manifest["files"]
+    return sorted(path for path in expected.keys() | files.keys() if expected.get(path) != files.get(path))
+
+
+def prove(directory, path, manifest_path=None):
+    """Inclusion proof of one file, self-contained together with the signed root."""
+    manifest = load_manifest(manifest_path or manifest_path_for(directory))
+    paths = list(manifest["files"])
+    position = paths.index(path)
+    levels = merkle_levels([leaf_hash(p, bytes.fromhex(manifest["files"][p])) for p in paths])
+    return {"user": manifest["user"], "root": manifest["root"], "signature": manifest["signature"],
+            "path": path, "digest": manifest["files"][path], "proof": inclusion_proof(levels, position)}
+
+
+def verify_file(proof, file_path):
+    """Check one file with its inclusion proof only; raises InvalidSignature on mismatch."""
+    verify_root(proof)
+    leaf = leaf_hash(proof["path"], file_digest(file_path))
+    if root_from_proof(leaf, proof["proof"]).hex() != proof["root"]:
+        raise InvalidSignature(f"{file_path} is not the file signed as {proof['path']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Signed Merkle-tree manifests for directories.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sign_parser = commands.add_parser("sign", help="sign a directory (only changed files are rehashed)")
+    sign_parser.add_argument("username")
+    sign_parser.add_argument("directory")
+    sign_parser.add_argument("--manifest")
+    sign_parser.add_argument("--index")
+    sign_parser.add_argument("--workers", type=int, default=None)
+    verify_parser = commands.add_parser("verify", help="rehash a directory and check it against its manifest")
+    verify_parser.add_argument("directory")
+    verify_parser.add_argument("--manifest")
+    verify_parser.add_argument("--workers", type=int, default=None)
+    prove_parser = commands.add_parser("prove", help="write the inclusion proof of one file")
+    prove_parser.add_argument("directory")
+    prove_parser.add_argument("path", help="path relative to the directory, with / separators")
+    prove_parser.add_argument("--manifest")
+    prove_parser.add_argument("--output", help="proof file (stdout by default)")
+    file_parser = commands.add_parser("verify-file", help="check one file against its inclusion proof")
+    file_parser.add_argument("proof")
+    file_parser.add_argument("file")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "sign":
+            sign_directory(args.username, args.directory, args.manifest, args.index, args.workers)
+        elif args.command == "verify":
+            differences = verify_directory(args.directory, args.manifest, args.workers)
+            for path in differences:
+                print(f"Changed: {path}")
+            print("Directory verified successfully." if not differences else "Verification failed.")
+            sys.exit(1 if differences else 0)
+        elif args.command == "prove":
+            proof = json.dumps(prove(args.directory, args.path, args.manifest), indent=2)
+            if args.output:
+                write_atomic(args.output, proof.encode("utf-8"))
+            else:
+                print(proof)
+        else:
+            with open(args.proof, "r", encoding="utf-8") as f:
+                verify_file(json.load(f), args.file)
+            print("File verified successfully.")
+    except (InvalidSignature, CertificateError, OSError, ValueError) as e:
+        print("Verification failed:", str(e) or type(e).__name__)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
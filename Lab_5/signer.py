@@ -0,0 +1,174 @@
+"""
+Long-lived signing service.
+
+Parsed private keys are kept in a bounded LRU cache keyed by user and reloaded when the key
+file's modification time changes. Batches of files are hashed and signed on a thread pool
+(hashlib and cryptography release the GIL), and requests can arrive over a Unix socket as
+JSON lines:
+
+    {"user": "tudor", "files": ["a.bin", "b.bin"]}
+    -> {"results": [{"file": "a.bin", "signature": "a.bin.sig"}, ...]}
+
+Example:
+    python signer.py serve --socket signer.sock
+    python signer.py sign tudor a.bin b.bin --socket signer.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives import serialization
+
+from utils import check_username, file_digest, sign_digest
+
+USERS_DIR = os.path.join("pki", "users")
+KEY_CACHE_SIZE = 64
+SOCKET_PATH = "signer.sock"
+
+
+class KeyCache:
+    """Bounded LRU cache of parsed private keys, invalidated when the key file changes."""
+
+    def __init__(self, users_dir=USERS_DIR, maxsize=KEY_CACHE_SIZE):
+        self.users_dir = users_dir
+        self.maxsize = maxsize
+        self._keys = OrderedDict()  # username -> (mtime_ns, private key)
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        key_path = os.path.join(self.users_dir, f"{check_username(username)}.key")
+        mtime = os.stat(key_path).st_mtime_ns
+        with self._lock:
+            entry = self._keys.get(username)
+            if entry and entry[0] == mtime:
+                self._keys.move_to_end(username)
+                return entry[1]
+        # parse outside the lock, so a slow RSA load does not block other users
+        with open(key_path, "rb") as f:
+            private_key = serialization.load_pem_private_key(f.read(), password=None)
+        with self._lock:
+            self._keys[username] = (mtime, private_key)
+            self._keys.move_to_end(username)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return private_key
+
+
+class SigningService:
+    def __init__(self, users_dir=USERS_DIR, cache_size=KEY_CACHE_SIZE, workers=None):
+        self.keys = KeyCache(users_dir, cache_size)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+
+    def sign(self, username, file_path):
+        """Sign one file, write `<file>.sig` and return its path."""
+        signature = sign_digest(self.keys.get(username), file_digest(file_path))
+        signature_path = f"{file_path}.sig"
+        with open(signature_path, "wb") as f:
+            f.write(signature)
+        return signature_path
+
+    def _sign_entry(self, username, file_path):
+        try:
+            return {"file": file_path, "signature": self.sign(username, file_path)}
+        except Exception as e:
+            return {"file": file_path, "error": str(e) or type(e).__name__}
+
+    def sign_batch(self, username, file_paths):
+        """Sign many files concurrently; one result dict per file, in order."""
+        check_username(username)
+        if not isinstance(file_paths, list) or not all(isinstance(path, str) for path in file_paths):
+            raise TypeError("files must be a list of paths")
+        return list(self.pool.map(lambda path: self._sign_entry(username, path), file_paths))
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def handle_client(service, reader, writer):
+    loop = asyncio.get_running_loop()
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+                results = await loop.run_in_executor(None, service.sign_batch, request["user"], request["files"])
+                response = {"results": results}
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"error": f"Invalid request: {e}"}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def serve(socket_path=SOCKET_PATH, service=None):
+    service = service or SigningService()
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    # the socket is created owner-only, whatever the umask: a chmod after the bind would leave a window
+    umask = os.umask(0o077)
+    try:
+        server = await asyncio.start_unix_server(lambda r, w: handle_client(service, r, w), path=socket_path)
+    finally:
+        os.umask(umask)
+    print(f"Signing service listening on {socket_path}")
+    async with server:
+        await server.serve_forever()
+
+
+def request_signatures(username, file_paths, socket_path=SOCKET_PATH):
+    """Client side: send one batch to a running service and return its results."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        payload = {"user": username, "files": [os.path.abspath(path) for path in file_paths]}
+        client.sendall(json.dumps(payload).encode() + b"\n")
+        with client.makefile("rb") as stream:
+            response = json.loads(stream.readline())
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Signing service with cached private keys.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the service on a Unix socket")
+    serve_parser.add_argument("--socket", default=SOCKET_PATH)
+    serve_parser.add_argument("--workers", type=int, default=None)
+    sign_parser = commands.add_parser("sign", help="sign files, through the service if --socket is given")
+    sign_parser.add_argument("username")
+    sign_parser.add_argument("files", nargs="+")
+    sign_parser.add_argument("--socket", help="socket of a running service")
+    sign_parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.socket, SigningService(workers=args.workers)))
+        except KeyboardInterrupt:
+            print("Signing service stopped.")
+        return
+    if args.socket:
+        results = request_signatures(args.username, args.files, args.socket)
+    else:
+        with SigningService(workers=args.workers) as service:
+            results = service.sign_batch(args.username, args.files)
+    for result in results:
+        if "error" in result:
+            print(f"Failed: {result['file']}: {result['error']}")
+        else:
+            print(f"File signed: {result['signature']}")
+
+
+if __name__ == "__main__":
+    main()
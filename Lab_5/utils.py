@@ -1,35 +1,188 @@
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.x509 import load_pem_x509_certificate
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, utils
+from cryptography.x509 import load_pem_x509_certificate, load_pem_x509_crl
+from datetime import datetime, timedelta, timezone
+import hashlib
+import mmap
 import os
+import threading
 
+CA_CERT_PATH = os.path.join("pki", "ca", "rootCA.pem")
+CRL_PATH = os.path.join("pki", "ca", "crl.pem")
+# A successful chain check is reused for this long (never past the certificate's expiry)
+VALIDATION_TTL = timedelta(minutes=10)
 
-def sign_file(username, file_path):
+# Files are hashed in chunks of this size, so memory stays flat whatever the file size
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# RSA-PSS over SHA-256; signing the prehashed digest gives the same signature format as signing the data
+PSS_PADDING = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH,
+)
+PREHASHED_SHA256 = utils.Prehashed(hashes.SHA256())
+# ECDSA P-256 signs the same prehashed digest; Ed25519 has no prehashed mode and signs the 32 digest bytes
+ECDSA_PREHASHED = ec.ECDSA(PREHASHED_SHA256)
+
+
+def stream_digest(stream, chunk_size=CHUNK_SIZE):
+    """SHA-256 of everything left in a binary stream (a file, a pipe or stdin), read in chunks."""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    with memoryview(buffer) as view:
+        while read := stream.readinto(buffer):
+            with view[:read] as chunk:
+                digest.update(chunk)
+    return digest.digest()
+
+
+def file_digest(file_path, chunk_size=CHUNK_SIZE, use_mmap=False):
+    """Stream the file through SHA-256 and return the 32-byte digest."""
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap and size:
+            digest = hashlib.sha256()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                for start in range(0, len(view), chunk_size):
+                    with view[start:start + chunk_size] as chunk:
+                        digest.update(chunk)
+            return digest.digest()
+        # small files get a small buffer; the +1 lets the final empty read detect EOF in one call
+        return stream_digest(f, min(chunk_size, size + 1))
+
+
+def sign_digest(private_key, digest):
+    """Sign a SHA-256 digest produced by file_digest with an RSA, Ed25519 or ECDSA key."""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(digest)
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        return private_key.sign(digest, ECDSA_PREHASHED)
+    return private_key.sign(digest, PSS_PADDING, PREHASHED_SHA256)
+
+
+def verify_digest(public_key, signature, digest):
+    """Raise InvalidSignature unless `signature` matches the SHA-256 digest."""
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        public_key.verify(signature, digest)
+    elif isinstance(public_key, ec.EllipticCurvePublicKey):
+        public_key.verify(signature, digest, ECDSA_PREHASHED)
+    else:
+        public_key.verify(signature, digest, PSS_PADDING, PREHASHED_SHA256)
+
+
+def write_atomic(path, data):
+    """Write to a temporary file next to `path` and rename it over, so readers never see a partial file."""
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def check_username(username):
+    """Reject anything but a plain file name, so a username can never point outside users_dir."""
+    if (not isinstance(username, str) or not username or username in (".", "..")
+            or os.path.basename(username) != username or (os.altsep and os.altsep in username)
+            or "\0" in username):
+        raise ValueError(f"Invalid username: {username!r}")
+    return username
+
+
+class CertificateError(ValueError):
+    """The certificate is not trusted: wrong issuer, outside its validity period, or revoked."""
+
+
+_ca_certs = {}  # CA certificate path -> (mtime_ns, certificate)
+_crls = {}  # CRL path -> (mtime_ns, CA fingerprint, revoked serials, next update)
+_validated = {}  # (certificate fingerprint, CA fingerprint) -> time until which the result holds
+_cache_lock = threading.Lock()
+
+
+def load_ca_certificate(ca_cert_path=CA_CERT_PATH):
+    """The root CA certificate, re-parsed only when the file's mtime changes."""
+    mtime = os.stat(ca_cert_path).st_mtime_ns
+    with _cache_lock:
+        entry = _ca_certs.get(ca_cert_path)
+        if entry and entry[0] == mtime:
+            return entry[1]
+    with open(ca_cert_path, "rb") as f:
+        ca_cert = load_pem_x509_certificate(f.read())
+    with _cache_lock:
+        _ca_certs[ca_cert_path] = (mtime, ca_cert)
+    return ca_cert
+
+
+def revoked_serials(ca_cert, crl_path=CRL_PATH, now=None):
+    """
+    Serial numbers listed in the local CRL, as a set (empty when there is no CRL file). The CRL
+    is re-read only when its mtime changes, must be signed by `ca_cert` and must not be past its
+    next update.
+    """
+    if not os.path.exists(crl_path):
+        return frozenset()
+    mtime = os.stat(crl_path).st_mtime_ns
+    ca_fingerprint = ca_cert.fingerprint(hashes.SHA256())
+    with _cache_lock:
+        entry = _crls.get(crl_path)
+    if not entry or entry[:2] != (mtime, ca_fingerprint):
+        with open(crl_path, "rb") as f:
+            crl = load_pem_x509_crl(f.read())
+        if not crl.is_signature_valid(ca_cert.public_key()):
+            raise CertificateError("CRL is not signed by the root CA")
+        entry = (mtime, ca_fingerprint, frozenset(revoked.serial_number for revoked in crl), crl.next_update_utc)
+        with _cache_lock:
+            _crls[crl_path] = entry
+    next_update = entry[3]
+    if next_update is not None and (now or datetime.now(timezone.utc)) > next_update:
+        raise CertificateError(f"CRL is stale: it should have been reissued by {next_update:%Y-%m-%d %H:%M} UTC")
+    return entry[2]
+
+
+def validate_certificate(cert, ca_cert_path=CA_CERT_PATH, crl_path=CRL_PATH, now=None):
+    """
+    Raise CertificateError unless `cert` was issued by the root CA, both are within their validity
+    periods and `cert` is not revoked by a current CRL. The CA signature check is cached per
+    (certificate, CA) pair.
+    """
+    now = now or datetime.now(timezone.utc)
+    ca_cert = load_ca_certificate(ca_cert_path)
+    if not ca_cert.not_valid_before_utc <= now <= ca_cert.not_valid_after_utc:
+        raise CertificateError("root CA certificate is expired or not yet valid")
+    if cert.serial_number in revoked_serials(ca_cert, crl_path, now):
+        raise CertificateError(f"certificate {cert.serial_number:x} is revoked")
+    if not cert.not_valid_before_utc <= now <= cert.not_valid_after_utc:
+        raise CertificateError("certificate is expired or not yet valid")
+    cache_key = (cert.fingerprint(hashes.SHA256()), ca_cert.fingerprint(hashes.SHA256()))
+    with _cache_lock:
+        valid_until = _validated.get(cache_key)
+    if valid_until and now <= valid_until:
+        return
+    try:
+        cert.verify_directly_issued_by(ca_cert)
+    except (ValueError, TypeError, InvalidSignature) as e:
+        raise CertificateError(f"certificate is not issued by the root CA: {str(e) or type(e).__name__}") from e
+    with _cache_lock:
+        _validated[cache_key] = min(now + VALIDATION_TTL, cert.not_valid_after_utc, ca_cert.not_valid_after_utc)
+
+
+def sign_file(username, file_path, use_mmap=False):
     signature_path = f"{file_path}.sig"
     user_key_path = os.path.join("pki", "users", f"{username}.key")
 
     with open(user_key_path, "rb") as f:
         user_private_key = serialization.load_pem_private_key(f.read(), password=None)
 
-    with open(file_path, "rb") as f:
-        data = f.read()
-
     print(f"Signing file: {file_path}...")
-    signature = user_private_key.sign(
-        data,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH,
-        ),
-        hashes.SHA256(),
-    )
+    digest = file_digest(file_path, use_mmap=use_mmap)
+    signature = sign_digest(user_private_key, digest)
     with open(signature_path, "wb") as f:
         f.write(signature)
 
     print(f"File signed: {signature_path}")
+    return signature_path
 
 
-def verify_signature(username, file_path, signature_path):
+def verify_signature(username, file_path, signature_path, use_mmap=False):
     user_cert_path = os.path.join("pki", "users", f"{username}.crt")
 
     with open(user_cert_path, "rb") as f:
@@ -37,22 +190,16 @@ def verify_signature(username, file_path, signature_path):
 
     user_public_key = user_cert.public_key()
 
-    with open(file_path, "rb") as f:
-        data = f.read()
     with open(signature_path, "rb") as f:
         signature = f.read()
 
     print(f"Verifying signature for: {file_path}...")
     try:
-        user_public_key.verify(
-            signature,
-            data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH,
-            ),
-            hashes.SHA256(),
-        )
+        validate_certificate(user_cert)
+        digest = file_digest(file_path, use_mmap=use_mmap)
+        verify_digest(user_public_key, signature, digest)
         print("Signature verified successfully.")
+        return True
     except Exception as e:
         print("Verification failed:", e)
+        return False
@@ -0,0 +1,131 @@
+"""
+Bulk signature verification.
+
+The manifest is a JSON-lines file with one entry per signed file:
+
+    {"user": "tudor", "file": "a.bin", "signature": "a.bin.sig"}
+
+("signature" defaults to `<file>.sig`). Certificates are parsed once and their public keys
+cached by certificate fingerprint; entries are verified concurrently on a thread pool and the
+result is a JSON report with a status ("valid", "invalid", "untrusted" or "error") and timing per
+entry. "untrusted" means the certificate failed the chain, expiry or revocation check.
+
+Example:
+    python verifier.py manifest.jsonl --report report.json
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.x509 import load_pem_x509_certificate
+
+from utils import CA_CERT_PATH, CRL_PATH, CertificateError, file_digest, validate_certificate, verify_digest
+
+USERS_DIR = os.path.join("pki", "users")
+
+
+class CertificateCache:
+    """
+    Certificates cached by fingerprint (SHA-256 of the certificate). The user's .crt file is
+    only re-read when its mtime changes.
+    """
+
+    def __init__(self, users_dir=USERS_DIR):
+        self.users_dir = users_dir
+        self._fingerprints = {}  # username -> (mtime_ns, fingerprint)
+        self._certificates = {}  # fingerprint -> (certificate, public key)
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        """Return (fingerprint, certificate, public key) of the user's certificate."""
+        cert_path = os.path.join(self.users_dir, f"{username}.crt")
+        mtime = os.stat(cert_path).st_mtime_ns
+        with self._lock:
+            entry = self._fingerprints.get(username)
+            if entry and entry[0] == mtime:
+                return (entry[1], *self._certificates[entry[1]])
+        with open(cert_path, "rb") as f:
+            cert = load_pem_x509_certificate(f.read())
+        fingerprint = cert.fingerprint(hashes.SHA256()).hex()
+        with self._lock:
+            cert, public_key = self._certificates.setdefault(fingerprint, (cert, cert.public_key()))
+            self._fingerprints[username] = (mtime, fingerprint)
+        return fingerprint, cert, public_key
+
+
+def read_manifest(manifest_path):
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry["user"], entry["file"], entry.get("signature", f"{entry['file']}.sig")
+
+
+def verify_entry(certificates, username, file_path, signature_path, ca_cert_path=CA_CERT_PATH, crl_path=CRL_PATH):
+    """Verify one manifest entry and return its report record."""
+    record = {"user": username, "file": file_path, "signature": signature_path}
+    started = time.perf_counter()
+    try:
+        fingerprint, cert, public_key = certificates.get(username)
+        record["certificate"] = fingerprint
+        validate_certificate(cert, ca_cert_path, crl_path)
+        with open(signature_path, "rb") as f:
+            signature = f.read()
+        verify_digest(public_key, signature, file_digest(file_path))
+        record["status"] = "valid"
+    except InvalidSignature:
+        record["status"] = "invalid"
+    except CertificateError as e:
+        record["status"] = "untrusted"
+        record["error"] = str(e)
+    except (OSError, ValueError) as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+    except Exception as e:
+        # e.g. a TypeError for an unsupported key type: one bad entry must not lose the whole report
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - started, 6)
+    return record
+
+
+def verify_manifest(entries, users_dir=USERS_DIR, workers=None, ca_cert_path=CA_CERT_PATH, crl_path=CRL_PATH):
+    """Verify (user, file, signature) triples concurrently; returns the report as a dict."""
+    certificates = CertificateCache(users_dir)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        records = list(pool.map(lambda entry: verify_entry(certificates, *entry, ca_cert_path, crl_path), entries))
+    summary = {status: sum(record["status"] == status for record in records)
+               for status in ("valid", "invalid", "untrusted", "error")}
+    return {"summary": summary, "seconds": round(time.perf_counter() - started, 6), "entries": records}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify many signatures listed in a manifest.")
+    parser.add_argument("manifest", help="JSON-lines file of {user, file, signature} entries")
+    parser.add_argument("--report", help="write the JSON report here instead of stdout")
+    parser.add_argument("--users-dir", default=USERS_DIR)
+    parser.add_argument("--ca-cert", default=CA_CERT_PATH)
+    parser.add_argument("--crl", default=CRL_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    report = verify_manifest(read_manifest(args.manifest), args.users_dir, args.workers, args.ca_cert, args.crl)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Verified {len(report['entries'])} entries in {report['seconds']:.2f} s: {report['summary']}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    sys.exit(0 if report["summary"]["valid"] == len(report["entries"]) else 1)
+
+
+if __name__ == "__main__":
+    main()
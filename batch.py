@@ -0,0 +1,214 @@
+"""
+Batch encryption/decryption of whole directory trees with the classical ciphers
+(Lab_1 Caesar, Lab_1 keyword Caesar, Lab_3 Playfair).
+
+Files are fanned out over a process pool and written to a mirror tree under the output
+directory. Caesar and keyword Caesar work character by character, so files above the
+chunk threshold are split into chunks handled by different workers and stitched back
+together in order. Playfair pairs letters across the whole text, so those files are
+always processed by a single worker.
+
+Example:
+    python batch.py caesar encrypt logs/ out/ --key 3
+    python batch.py playfair decrypt "data/**/*.txt" out/ --keyword SECRETKEY
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from labs import load_lab_module
+
+CHUNK_SIZE = 8 << 20  # files larger than this are split into chunks of this size
+MIN_CHUNK_SIZE = 4  # a UTF-8 character takes up to 4 bytes, so smaller chunks could not advance
+
+CIPHER_MODULES = {
+    'caesar': ('Lab_1', 'Task1.py'),
+    'keyword-caesar': ('Lab_1', 'Task2.py'),
+    'playfair': ('Lab_3', 'main.py'),
+}
+SPLITTABLE = {'caesar', 'keyword-caesar'}
+
+
+def load_cipher_module(cipher):
+    """Load the lab module implementing `cipher`."""
+    return load_lab_module(*CIPHER_MODULES[cipher])
+
+
+def transform(cipher, operation, data, key, keyword):
+    """Apply one cipher operation to a block of bytes and return the resulting bytes."""
+    module = load_cipher_module(cipher)
+    if cipher == 'caesar':
+        if operation == 'encrypt':
+            return module.encryptBytes(data, key)
+        return module.decryptBytes(data, key)
+    text = data.decode('utf-8')
+    if cipher == 'keyword-caesar':
+        if operation == 'encrypt':
+            return module.encrypt(text, key, keyword).encode('utf-8')
+        return module.decrypt(text, key, keyword).encode('utf-8')
+    # the stream API maps J to I and folds the Romanian letter variants, so any text is accepted
+    stream = module.encrypt_stream if operation == 'encrypt' else module.decrypt_stream
+    return ''.join(stream([text], keyword)).encode('utf-8')
+
+
+def collect_files(source):
+    """Return (base_dir, files) for a directory tree or a glob pattern."""
+    if os.path.isdir(source):
+        files = [os.path.join(dirpath, name)
+                 for dirpath, _, names in os.walk(source) for name in names]
+        return source, sorted(files)
+    parts = []
+    for part in os.path.normpath(source).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    base_dir = os.sep.join(parts) or os.curdir
+    files = [path for path in glob.glob(source, recursive=True) if os.path.isfile(path)]
+    return base_dir, sorted(files)
+
+
+def utf8_boundary(f, offset):
+    """Move `offset` back so it does not fall inside a multi-byte UTF-8 character."""
+    for _ in range(3):
+        f.seek(offset)
+        if f.read(1)[0] & 0xC0 != 0x80:
+            break
+        offset -= 1
+    return offset
+
+
+def plan_chunks(path, cipher, chunk_size):
+    """Split a file into (offset, length) ranges; unsplittable or small files are one range."""
+    size = os.path.getsize(path)
+    if cipher not in SPLITTABLE or size <= chunk_size:
+        return [(0, size)]
+    offsets = [0]
+    with open(path, 'rb') as f:
+        while offsets[-1] + chunk_size < size:
+            offset = offsets[-1] + chunk_size
+            if cipher != 'caesar':
+                offset = utf8_boundary(f, offset)
+            assert offset > offsets[-1], "chunk offsets must strictly increase"
+            offsets.append(offset)
+    offsets.append(size)
+    return [(start, end - start) for start, end in zip(offsets, offsets[1:])]
+
+
+def process_chunk(cipher, operation, path, offset, length, part_path, key, keyword):
+    """Worker: transform one byte range of `path` into `part_path`. Returns (bytes read, seconds)."""
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(length)
+    result = transform(cipher, operation, data, key, keyword)
+    with open(part_path, 'wb') as f:
+        f.write(result)
+    return len(data), time.perf_counter() - start
+
+
+def assemble(parts, output_path):
+    """Concatenate the part files in order into `output_path` and remove them."""
+    if len(parts) == 1:
+        os.replace(parts[0], output_path)
+        return
+    with open(output_path, 'wb') as out:
+        for part in parts:
+            with open(part, 'rb') as f:
+                while True:
+                    block = f.read(1 << 20)
+                    if not block:
+                        break
+                    out.write(block)
+            os.remove(part)
+
+
+def run_batch(cipher, operation, source, output_dir, key=0, keyword='', workers=None,
+              chunk_size=CHUNK_SIZE):
+    """
+    Encrypt or decrypt every file matched by `source` into a mirror tree under `output_dir`.
+    Returns (per_file, total): per_file maps the input path to (bytes, worker seconds, error),
+    error being None on success; total is (bytes, wall seconds). A file that fails leaves no
+    output behind and does not stop the others.
+    """
+    if chunk_size < MIN_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be at least {MIN_CHUNK_SIZE} bytes")
+    base_dir, files = collect_files(source)
+    wall_start = time.perf_counter()
+    per_file = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for path in files:
+            output_path = os.path.join(output_dir, os.path.relpath(path, base_dir))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            futures = []
+            for index, (offset, length) in enumerate(plan_chunks(path, cipher, chunk_size)):
+                part_path = f"{output_path}.part{index}"
+                futures.append((part_path, pool.submit(process_chunk, cipher, operation, path,
+                                                       offset, length, part_path, key, keyword)))
+            pending[path] = (output_path, futures)
+        for path, (output_path, futures) in pending.items():
+            processed, seconds, error = 0, 0.0, None
+            for _, future in futures:
+                try:
+                    done_bytes, done_seconds = future.result()
+                except Exception as e:
+                    error = error or f"{type(e).__name__}: {e}"
+                    continue
+                processed += done_bytes
+                seconds += done_seconds
+            parts = [part for part, _ in futures]
+            if error is None:
+                assemble(parts, output_path)
+            else:
+                for part in parts:
+                    if os.path.exists(part):
+                        os.remove(part)
+            per_file[path] = (processed, seconds, error)
+    total_bytes = sum(processed for processed, _, error in per_file.values() if error is None)
+    return per_file, (total_bytes, time.perf_counter() - wall_start)
+
+
+def throughput(processed, seconds):
+    return processed / (1 << 20) / seconds if seconds > 0 else float('inf')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt directory trees with the classical ciphers.")
+    parser.add_argument('cipher', choices=sorted(CIPHER_MODULES))
+    parser.add_argument('operation', choices=['encrypt', 'decrypt'])
+    parser.add_argument('source', help="directory or glob pattern (use ** for recursion)")
+    parser.add_argument('output', help="directory receiving the mirror tree")
+    parser.add_argument('--key', type=int, default=0, help="shift for caesar / k1 for keyword-caesar")
+    parser.add_argument('--keyword', default='', help="k2 for keyword-caesar / key for playfair")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="split threshold in bytes")
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < MIN_CHUNK_SIZE:
+        parser.error(f"--chunk-size must be at least {MIN_CHUNK_SIZE} bytes")
+    if args.cipher == 'caesar' and not 0 <= args.key <= 25:
+        parser.error("caesar key must be between 0 and 25")
+    if args.cipher == 'keyword-caesar' and (not 1 <= args.key <= 25 or len(args.keyword) < 7):
+        parser.error("keyword-caesar needs --key between 1 and 25 and a --keyword of at least 7 letters")
+    if args.cipher == 'playfair' and len(args.keyword) < 7:
+        parser.error("playfair needs a --keyword of at least 7 characters")
+
+    per_file, (total_bytes, wall) = run_batch(args.cipher, args.operation, args.source, args.output,
+                                              args.key, args.keyword, args.workers, args.chunk_size)
+    failed = 0
+    for path, (processed, seconds, error) in per_file.items():
+        if error:
+            failed += 1
+            print(f"{path}: FAILED, {error}")
+        else:
+            print(f"{path}: {processed} bytes, {seconds:.3f} s, {throughput(processed, seconds):.2f} MB/s")
+    print(f"Total: {len(per_file) - failed} files, {total_bytes} bytes, {wall:.3f} s, "
+          f"{throughput(total_bytes, wall):.2f} MB/s" + (f", {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Benchmarks for the cipher and PKI hot paths of every lab.
+
+Inputs are synthetic and deterministic (seeded), from 1 KB up to 1 GB. Functions that take the
+whole text in memory are capped at WHOLE_TEXT_LIMIT (they peak at 15-40x their input); the
+streaming APIs cover the larger sizes. For each function and size the best of several timed runs
+gives the throughput (MB/s, 1 MB = 2**20 bytes as in batch.py) and calls per second, and one
+extra run under tracemalloc gives the peak Python memory. Results are written as JSON; the
+compare command checks them against a stored baseline and fails on regressions. Everything
+runs offline: the PKI used by the signing benchmarks is generated in a temporary directory.
+
+Example:
+    python benchmarks/bench.py run --sizes 1K,64K,1M --output baseline.json
+    python benchmarks/bench.py run --sizes 1K,64K,1M --output current.json
+    python benchmarks/bench.py compare baseline.json current.json --threshold 0.10
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from labs import load_lab_module  # noqa: E402
+
+SEED = 2024
+UNITS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+DEFAULT_SIZES = '1K,64K,1M'
+MIN_TIME = 0.2  # each measurement repeats the call for at least this long...
+MAX_REPEATS = 20  # ...but at most this many times
+DES_KEYS = 256  # keys per des_key_schedule call
+GENERATED_BLOCK = 1 << 20  # random text is generated once per block and then repeated
+WHOLE_TEXT_LIMIT = 16 << 20  # largest input for cases that hold the whole text (and its copies) in memory
+MB = 1 << 20
+PLAYFAIR_ALPHABET = 'ABCDEFGHIKLMNOPQRSTUVWXYZ '  # J has no cell in the 6x5 matrix
+
+
+def parse_size(text):
+    text = text.strip().upper().rstrip('B')
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return f"{size // UNITS[unit]}{unit}"
+    return str(size)
+
+
+def synthetic_text(size, alphabet='ABCDEFGHIJKLMNOPQRSTUVWXYZ     ', seed=SEED):
+    """`size` characters of seeded random text; blocks of 1 MB are repeated for large sizes."""
+    rng = random.Random(f"{seed}:{alphabet}")
+    block = ''.join(rng.choices(alphabet, k=min(size, GENERATED_BLOCK)))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def synthetic_file(directory, size, seed=SEED):
+    """A file of `size` seeded random bytes, written in blocks so 1 GB inputs need no 1 GB buffer."""
+    path = os.path.join(directory, f"input-{format_size(size)}.bin")
+    if not os.path.exists(path):
+        block = random.Random(seed).randbytes(min(size, GENERATED_BLOCK))
+        with open(path, 'wb') as f:
+            for start in range(0, size, len(block)):
+                f.write(block[:size - start])
+    return path
+
+
+def synthetic_text_file(directory, size, alphabet='ABCDEFGHIJKLMNOPQRSTUVWXYZ     '):
+    """A file of `size` characters of synthetic_text (ASCII alphabets only, so characters = bytes)."""
+    path = os.path.join(directory, f"text-{format_size(size)}-{len(alphabet)}.txt")
+    if not os.path.exists(path):
+        block = synthetic_text(min(size, GENERATED_BLOCK), alphabet).encode('ascii')
+        with open(path, 'wb') as f:
+            for start in range(0, size, len(block)):
+                f.write(block[:size - start])
+    return path
+
+
+def drain(iterable):
+    """Consume a generator without keeping what it yields."""
+    collections.deque(iterable, maxlen=0)
+
+
+@contextlib.contextmanager
+def pki_workspace():
+    """Temporary working directory with a fresh CA and one user, as Lab_5 expects under ./pki."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-") as directory:
+        os.chdir(directory)
+        try:
+            # Lab_5/main.py imports its sibling `utils`; no other lab loaded here imports a bare `utils`
+            sys.path.insert(0, os.path.join(ROOT_DIR, 'Lab_5'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                lab5 = load_lab_module('Lab_5', 'main.py')
+                lab5.generate_ca()
+                lab5.generate_user_certificate('bench')
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+def quiet(function):
+    """Wrap a function that prints progress (sign_file, verify_signature) so it does not flood the output."""
+    def call(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return function(*args)
+    return call
+
+
+# Each case maps a size to (callable without arguments, bytes processed per call or None);
+# preparing the input happens in the case, outside the timed region.
+
+def case_caesar_encrypt(size, workspace):
+    task1 = load_lab_module('Lab_1', 'Task1.py')
+    text = synthetic_text(size)
+    return lambda: task1.encrypt(text, 3), size
+
+
+def case_caesar_encrypt_bytes(size, workspace):
+    task1 = load_lab_module('Lab_1', 'Task1.py')
+    data = synthetic_text(size).encode('ascii')
+    return lambda: task1.encryptBytes(data, 3), size
+
+
+def case_keyword_caesar_encrypt(size, workspace):
+    task2 = load_lab_module('Lab_1', 'Task2.py')
+    text = synthetic_text(size)
+    return lambda: task2.encrypt(text, 3, 'KEYWORD'), size
+
+
+def case_find_frequency(size, workspace):
+    utils = load_lab_module('Lab_2', 'utils.py')
+    text = synthetic_text(size)
+    return lambda: utils.find_frequency(text), size
+
+
+def case_file_frequency(size, workspace):
+    utils = load_lab_module('Lab_2', 'utils.py')
+    path = synthetic_text_file(workspace, size)
+    return lambda: utils.file_frequency(path), size
+
+
+def case_playfair_encrypt_message(size, workspace):
+    lab3 = load_lab_module('Lab_3', 'main.py')
+    text = synthetic_text(size, alphabet=PLAYFAIR_ALPHABET.replace(' ', 'ĂÂÎȘȚ '))
+    return lambda: lab3.encrypt_message(text, 'CRIPTOGRAFIE'), size
+
+
+def case_playfair_encrypt_stream(size, workspace):
+    lab3 = load_lab_module('Lab_3', 'main.py')
+    path = synthetic_text_file(workspace, size, PLAYFAIR_ALPHABET)
+    return lambda: drain(lab3.encrypt_stream(lab3.read_chunks(path), 'CRIPTOGRAFIE')), size
+
+
+def case_des_key_schedule(size, workspace):
+    lab4 = load_lab_module('Lab_4', 'main.py')
+    rng = random.Random(SEED)
+    keys = [format(rng.getrandbits(64), '064b') for _ in range(DES_KEYS)]
+
+    def run():
+        for key in keys:
+            lab4.des_key_schedule(key, 16)
+    return run, None
+
+
+def case_sign_file(size, workspace):
+    utils = load_lab_module('Lab_5', 'utils.py')
+    path = synthetic_file(workspace, size)
+    return lambda: quiet(utils.sign_file)('bench', path), size
+
+
+def case_verify_signature(size, workspace):
+    utils = load_lab_module('Lab_5', 'utils.py')
+    path = synthetic_file(workspace, size)
+    signature_path = quiet(utils.sign_file)('bench', path)
+    return lambda: quiet(utils.verify_signature)('bench', path, signature_path), size
+
+
+# name -> (case, sized, largest size or None); larger requested sizes are skipped
+CASES = {
+    'caesar.encrypt': (case_caesar_encrypt, True, None),
+    'caesar.encryptBytes': (case_caesar_encrypt_bytes, True, None),
+    'keyword-caesar.encrypt': (case_keyword_caesar_encrypt, True, None),
+    'freq.find_frequency': (case_find_frequency, True, WHOLE_TEXT_LIMIT),  # ~15x the input
+    'freq.file_frequency': (case_file_frequency, True, None),
+    'playfair.encrypt_message': (case_playfair_encrypt_message, True, WHOLE_TEXT_LIMIT),  # ~40x the input
+    'playfair.encrypt_stream': (case_playfair_encrypt_stream, True, None),
+    'des.des_key_schedule': (case_des_key_schedule, False, None),  # size-independent: DES_KEYS keys per call
+    'pki.sign_file': (case_sign_file, True, None),
+    'pki.verify_signature': (case_verify_signature, True, None),
+}
+
+
+def measure(function, processed, track_memory=True):
+    """Best-of-N timing plus an optional tracemalloc run; returns the result record."""
+    timings = []
+    started = time.perf_counter()
+    while not timings or (time.perf_counter() - started < MIN_TIME and len(timings) < MAX_REPEATS):
+        begin = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - begin)
+    best = min(timings)
+    record = {'seconds': best, 'repeats': len(timings), 'ops_s': 1 / best if best else None}
+    if processed is not None:
+        record['bytes'] = processed
+        record['mb_s'] = processed / best / MB if best else None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            function()
+            record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return record
+
+
+def run_benchmarks(sizes, selected=None, track_memory=True):
+    results = {}
+    with pki_workspace() as workspace:
+        for name, (case, sized, max_size) in CASES.items():
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            for size in (sizes if sized else [None]):
+                key = f"{name}@{format_size(size)}" if sized else name
+                if max_size is not None and size > max_size:
+                    print(f"{key:36} skipped: above the {format_size(max_size)} limit of this case", flush=True)
+                    continue
+                function, processed = case(size, workspace)
+                results[key] = measure(function, processed, track_memory)
+                report_line(key, results[key])
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+
+def report_line(key, record):
+    throughput = f"{record['mb_s']:10.2f} MB/s" if record.get('mb_s') is not None else ' ' * 15
+    memory = f"{record['peak_bytes'] / MB:10.2f} MB peak" if 'peak_bytes' in record else ''
+    print(f"{key:36} {throughput} {record['ops_s']:12.2f} ops/s {memory}", flush=True)
+
+
+def compare(baseline, current, threshold):
+    """
+    Return (key, metric, baseline value, current value, change) for every regression: throughput
+    (MB/s, or ops/s when there is none) lower, or peak memory higher, by more than `threshold`.
+    """
+    regressions = []
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        metric = 'mb_s' if old.get('mb_s') is not None else 'ops_s'
+        if old.get(metric) and new.get(metric) is not None:
+            change = new[metric] / old[metric] - 1
+            if change < -threshold:
+                regressions.append((key, metric, old[metric], new[metric], change))
+        if old.get('peak_bytes') and new.get('peak_bytes') is not None:
+            change = new['peak_bytes'] / old['peak_bytes'] - 1
+            if change > threshold:
+                regressions.append((key, 'peak_bytes', old['peak_bytes'], new['peak_bytes'], change))
+    return regressions
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the labs' cipher and PKI functions.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="run the benchmarks and save the results as JSON")
+    run_parser.add_argument('--sizes', default=DEFAULT_SIZES, help="comma-separated input sizes, 1K to 1G")
+    run_parser.add_argument('--only', nargs='*', help="run only cases whose name contains one of these")
+    run_parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak-memory run")
+    run_parser.add_argument('--output', help="results file (JSON)")
+    compare_parser = commands.add_parser('compare', help="flag regressions against a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10, help="allowed relative change (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        sizes = [parse_size(size) for size in args.sizes.split(',')]
+        results = run_benchmarks(sizes, args.only, not args.no_memory)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {args.output}")
+        return 0
+
+    regressions = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+    for key, metric, old, new, change in regressions:
+        print(f"REGRESSION {key} {metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
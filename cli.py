@@ -0,0 +1,190 @@
+"""
+One non-interactive command for all the labs. Every subcommand reads stdin and writes stdout,
+so they compose in shell pipelines:
+
+    echo "attack at dawn" | python cli.py caesar encrypt --key 3 | python cli.py caesar decrypt --key 3
+    python cli.py keyword-caesar encrypt --key 5 --keyword CRYPTO < message.txt
+    python cli.py freq --ngram 2 --top 10 < Lab_2/encrypted.txt
+    python cli.py substitute --key QWERTYUIOPASDFGHJKLZXCVBNM < ciphertext.txt
+    python cli.py playfair encrypt --key SECRET < plain.txt > cipher.txt
+    echo 133457799BBCDFF1 | python cli.py des-keys
+    python cli.py sign tudor --pki Lab_5/pki < release.tar > release.tar.sig
+    python cli.py verify tudor release.tar.sig --pki Lab_5/pki < release.tar
+
+Lab modules are loaded only by the subcommand that needs them, so the cipher subcommands never
+import numpy, matplotlib or cryptography and start in a few tens of milliseconds.
+"""
+import argparse
+import os
+import sys
+
+from labs import load_lab_module
+
+CHUNK_SIZE = 1 << 20  # bytes (or characters) read from stdin at a time
+
+
+def read_binary(chunk_size=CHUNK_SIZE):
+    while chunk := sys.stdin.buffer.read(chunk_size):
+        yield chunk
+
+
+def read_text(chunk_size=CHUNK_SIZE):
+    sys.stdin.reconfigure(encoding='utf-8', errors='replace')
+    while chunk := sys.stdin.read(chunk_size):
+        yield chunk
+
+
+def write_text(chunks):
+    sys.stdout.reconfigure(encoding='utf-8')
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+
+
+def run_caesar(args):
+    task1 = load_lab_module('Lab_1', 'Task1.py')
+    transform = task1.encryptBytes if args.operation == 'encrypt' else task1.decryptBytes
+    for chunk in read_binary():
+        sys.stdout.buffer.write(transform(chunk, args.key))
+
+
+def run_keyword_caesar(args):
+    cipher = load_lab_module('Lab_1', 'Task2.py').get_cipher(args.key, args.keyword)
+    write_text(map(cipher.encrypt if args.operation == 'encrypt' else cipher.decrypt, read_text()))
+
+
+def run_freq(args):
+    utils = load_lab_module('Lab_2', 'utils.py')
+    counter = utils.NgramCounter(orders=(args.ngram,), fold_case=not args.case_sensitive)
+    for chunk in read_binary():
+        counter.update(chunk)
+    if args.top:
+        items = counter.most_common(args.ngram, args.top)
+    else:
+        items = sorted(counter.frequency(args.ngram).items())
+    for ngram, count in items:
+        print(f"{ngram} {count}")
+
+
+def run_substitute(args):
+    utils = load_lab_module('Lab_2', 'utils.py')
+    if len(args.key) != 26 or not args.key.isalpha():
+        raise ValueError("The key must be 26 letters: the plaintext letters for cipher letters A..Z.")
+    key = utils.SubstitutionKey(dict(zip(utils.LETTERS, args.key)))
+    write_text(key.apply(chunk.upper()) for chunk in read_text())
+
+
+def run_playfair(args):
+    lab3 = load_lab_module('Lab_3', 'main.py')
+    stream = lab3.encrypt_stream if args.operation == 'encrypt' else lab3.decrypt_stream
+    write_text(stream(read_text(), args.key))
+    sys.stdout.write('\n')
+
+
+def parse_des_key(text):
+    """A DES key as 16 hex digits or 64 binary digits."""
+    text = text.strip()
+    if len(text) == 64 and set(text) <= {'0', '1'}:
+        return int(text, 2)
+    if len(text) == 16:
+        return int(text, 16)
+    raise ValueError(f"Invalid DES key: {text!r} (expected 16 hex or 64 binary digits)")
+
+
+def run_des_keys(args):
+    lab4 = load_lab_module('Lab_4', 'main.py')
+    keys = [args.key] if args.key else (line for line in sys.stdin if line.strip())
+    for key in keys:
+        print(' '.join(f"{subkey:012X}" for subkey in lab4.key_schedule(parse_des_key(key))))
+
+
+def run_sign(args):
+    from cryptography.hazmat.primitives import serialization
+
+    utils = load_lab_module('Lab_5', 'utils.py')
+    with open(os.path.join(args.pki, "users", f"{args.username}.key"), "rb") as f:
+        private_key = serialization.load_pem_private_key(f.read(), password=None)
+    sys.stdout.buffer.write(utils.sign_digest(private_key, utils.stream_digest(sys.stdin.buffer)))
+
+
+def run_verify(args):
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.x509 import load_pem_x509_certificate
+
+    utils = load_lab_module('Lab_5', 'utils.py')
+    with open(os.path.join(args.pki, "users", f"{args.username}.crt"), "rb") as f:
+        cert = load_pem_x509_certificate(f.read())
+    with open(args.signature, "rb") as f:
+        signature = f.read()
+    try:
+        utils.validate_certificate(cert, os.path.join(args.pki, "ca", "rootCA.pem"),
+                                   os.path.join(args.pki, "ca", "crl.pem"))
+        utils.verify_digest(cert.public_key(), signature, utils.stream_digest(sys.stdin.buffer))
+    except (InvalidSignature, utils.CertificateError) as e:
+        print("Verification failed:", str(e) or type(e).__name__, file=sys.stderr)
+        return 1
+    print("Signature verified successfully.")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Classical ciphers, DES key schedule and PKI signing, stdin to stdout.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    caesar = commands.add_parser('caesar', help="Caesar cipher (Lab_1)")
+    caesar.add_argument('operation', choices=('encrypt', 'decrypt'))
+    caesar.add_argument('--key', type=int, required=True)
+    caesar.set_defaults(run=run_caesar)
+
+    keyword = commands.add_parser('keyword-caesar', help="Caesar cipher over a keyword-permuted alphabet (Lab_1)")
+    keyword.add_argument('operation', choices=('encrypt', 'decrypt'))
+    keyword.add_argument('--key', type=int, required=True)
+    keyword.add_argument('--keyword', required=True)
+    keyword.set_defaults(run=run_keyword_caesar)
+
+    freq = commands.add_parser('freq', help="letter / n-gram frequencies (Lab_2)")
+    freq.add_argument('--ngram', type=int, choices=(1, 2, 3, 4), default=1)
+    freq.add_argument('--top', type=int, default=0, help="only the N most frequent, by count")
+    freq.add_argument('--case-sensitive', action='store_true', help="count only upper-case letters")
+    freq.set_defaults(run=run_freq)
+
+    substitute = commands.add_parser('substitute', help="monoalphabetic substitution (Lab_2)")
+    substitute.add_argument('--key', required=True, help="26 plaintext letters for cipher letters A..Z")
+    substitute.set_defaults(run=run_substitute)
+
+    playfair = commands.add_parser('playfair', help="Romanian 6x5 Playfair cipher (Lab_3)")
+    playfair.add_argument('operation', choices=('encrypt', 'decrypt'))
+    playfair.add_argument('--key', required=True)
+    playfair.set_defaults(run=run_playfair)
+
+    des_keys = commands.add_parser('des-keys', help="DES round keys K1..K16 (Lab_4), one key per stdin line")
+    des_keys.add_argument('--key', help="a single key instead of reading stdin")
+    des_keys.set_defaults(run=run_des_keys)
+
+    for name, run, help_text in (('sign', run_sign, "sign stdin, signature to stdout (Lab_5)"),
+                                 ('verify', run_verify, "verify stdin against a signature file (Lab_5)")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument('username')
+        if name == 'verify':
+            command.add_argument('signature')
+        command.add_argument('--pki', default="pki", help="PKI directory with ca/ and users/")
+        command.set_defaults(run=run)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        status = args.run(args)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader of a pipeline went away (e.g. `| head`); stop quietly
+        sys.stdout = None
+        return 1
+    except (ValueError, OSError) as e:
+        print(f"{args.command}: {e}", file=sys.stderr)
+        return 1
+    return status or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
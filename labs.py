@@ -0,0 +1,22 @@
+"""
+Loading of the lab modules by path. Every lab has its own `main.py` or `utils.py`, so they are
+registered in sys.modules under names that include the lab ("lab_2_utils", "lab_3_main") and
+each one is executed only once per process, whoever asks for it first (cli.py, batch.py, the
+benchmarks or another lab).
+"""
+import importlib.util
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_lab_module(lab, filename):
+    """Load a lab module by path, under a name that cannot clash with the other labs' modules."""
+    name = f"{lab.lower()}_{os.path.splitext(filename)[0].lower()}"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT_DIR, lab, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]